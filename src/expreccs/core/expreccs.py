@@ -16,7 +16,7 @@ from expreccs.utils.backcoupling import (
 )
 from expreccs.utils.inputvalues import process_input
 from expreccs.utils.mapproperties import mapping_properties
-from expreccs.utils.reg_sit_given_decks import create_deck
+from expreccs.utils.reg_sit_given_decks import create_deck, create_decks
 from expreccs.utils.runs import plotting, run_models
 from expreccs.utils.writefile import write_folders, write_properties
 from expreccs.visualization.plotting import plot_results
@@ -40,6 +40,10 @@ def main(argv: list[str] | None = None) -> None:
     dic["acoeff"] = cmdargs.acoeff.split(",")
     dic["boundaries"] = [int(val) for val in cmdargs.boundaries[1:-1].split(",")]
     dic["compare"] = cmdargs.compare
+    dic["halo"] = int(cmdargs.halo)
+    dic["jobs"] = int(cmdargs.jobs)
+    dic["link"] = cmdargs.link
+    dic["binary"] = int(cmdargs.binary) == 1
 
     if dic["compare"]:
         print("\nExecuting the compare functionality in expreccs, please wait.")
@@ -57,14 +61,29 @@ def main(argv: list[str] | None = None) -> None:
         + f"The generated files have been written to {dic['fol']}/\n"
     )
 
+    if len(file) > 2:
+        dic["reg"], dic["freg"] = deck_path(file[0])
+        create_decks(
+            dic["fol"],
+            dic["explicit"],
+            dic["zones"],
+            dic["freq"],
+            dic["nonregular"],
+            dic["acoeff"],
+            dic["boundaries"],
+            dic["reg"],
+            dic["freg"],
+            [deck_path(path) for path in file[1:]],
+            dic["halo"],
+            dic["jobs"],
+            link=dic["link"],
+        )
+        print(text)
+        return
+
     if len(file) > 1:
         for i, name in enumerate(["reg", "sit"]):
-            dic[name] = file[i].split("/")[-1]
-            dic[f"f{name}"] = (
-                os.path.abspath("/".join(file[i].split("/")[:-1]))
-                if "/" in file[i]
-                else os.path.abspath(".")
-            )
+            dic[name], dic[f"f{name}"] = deck_path(file[i])
         create_deck(
             dic["fol"],
             dic["explicit"],
@@ -77,6 +96,9 @@ def main(argv: list[str] | None = None) -> None:
             dic["freg"],
             dic["sit"],
             dic["fsit"],
+            dic["halo"],
+            dic["jobs"],
+            link=dic["link"],
         )
         print(text)
         return
@@ -131,14 +153,20 @@ def main(argv: list[str] | None = None) -> None:
     os.chdir(cwd)
 
 
+def deck_path(path: str) -> tuple[str, str]:
+    """Split the path to a deck into the deck name and the absolute folder"""
+    folder = os.path.abspath("/".join(path.split("/")[:-1])) if "/" in path else "."
+    return path.split("/")[-1], os.path.abspath(folder)
+
+
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     """Argument options"""
     parser = argparse.ArgumentParser(
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
         description="Main method to simulate regional and site reservoirs for CO2 storage. "
         "The valid flags for toml configuration files are -i, -o, -m, -c, -p, -u, -r, -t, "
-        "-w, -l. The valid flags for paths to the regional and site folders are -i, -o, -b, "
-        "-f, -a, -w, -e, -z, -n",
+        "-w, -l, -x. The valid flags for paths to the regional and site folders are -i, -o, -b, "
+        "-f, -a, -w, -e, -z, -n, -d, -j, -k",
     )
     parser.add_argument(
         "-i",
@@ -146,7 +174,9 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         type=str.strip,
         default="input.toml",
         help="The base name of the configuration file; or paths (space between them and "
-        "quotation marks) to the regional and site models",
+        "quotation marks) to the regional and site models, where several site models "
+        "can be given to write the files of each site in a subfolder of the output "
+        "named as the site folder",
     )
     parser.add_argument(
         "-o",
@@ -254,6 +284,43 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         help="Set to '1' for a site with irregular contour, i.e., not defined in a "
         "rectangle",
     )
+    parser.add_argument(
+        "-d",
+        "--halo",
+        type=str.strip,
+        default="2",
+        help="Number of regional cells to include around the site footprint when "
+        "building the projections, i.e., only the regional columns inside this "
+        "window are processed; set to '-1' to use the whole regional model",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=str.strip,
+        default="1",
+        help="Number of processes to project and write the BCPROP files in parallel, "
+        "i.e., the site report steps are split in chunks between the processes",
+    )
+    parser.add_argument(
+        "-k",
+        "--link",
+        type=str.strip,
+        choices=["copy", "hard", "symbolic"],
+        default="copy",
+        help="Set to 'hard' or 'symbolic' to link the include files of the site "
+        "folder in the output folder instead of copying them (hard links fall back "
+        "to copies across file systems)",
+    )
+    parser.add_argument(
+        "-x",
+        "--binary",
+        type=str.strip,
+        choices=["0", "1"],
+        default="0",
+        help="Set to '1' to write the grid, FIPNUM, and OPERNUM arrays of the "
+        "toml configuration workflow in unformatted files (.IMP) that the decks read "
+        "with the IMPORT keyword, instead of text include files",
+    )
     return parser.parse_args(argv)
 
 
@@ -285,16 +352,18 @@ def check_cmdargs(cmdargs: argparse.Namespace) -> None:
         raise SystemExit(1)
 
     input_paths = input_value.split()
-    if len(input_paths) not in [1, 2]:
+    configuration_input = len(input_paths) == 1
+    folder_input = len(input_paths) > 1
+
+    site_folders = [deck_path(path)[1] for path in input_paths[1:]]
+    site_names = [os.path.basename(folder) for folder in site_folders]
+    if len(input_paths) > 2 and len(set(site_names)) < len(site_names):
         print(
-            f"\nInvalid value '-i {input_value}', expected one configuration "
-            "file or two model-folder paths separated by a space.\n"
+            f"\nInvalid value '-i {input_value}', the site models must be in "
+            "folders with different names when giving several sites.\n"
         )
         raise SystemExit(1)
 
-    configuration_input = len(input_paths) == 1
-    folder_input = len(input_paths) == 2
-
     if configuration_input and not input_paths[0].lower().endswith(".toml"):
         print(
             f"\nInvalid extension for '-i {input_value}', the valid extension "
@@ -371,6 +440,16 @@ def check_cmdargs(cmdargs: argparse.Namespace) -> None:
         )
         raise SystemExit(1)
 
+    halo = cmdargs.halo
+    if not re.fullmatch(r"-1|\d+", halo):
+        print(f"\nInvalid value '-d {halo}', expected a non-negative integer or -1.\n")
+        raise SystemExit(1)
+
+    jobs = cmdargs.jobs
+    if not re.fullmatch(r"[1-9]\d*", jobs):
+        print(f"\nInvalid value '-j {jobs}', expected a positive integer.\n")
+        raise SystemExit(1)
+
     compare = cmdargs.compare
     if compare:
         compare_options = {
@@ -384,6 +463,10 @@ def check_cmdargs(cmdargs: argparse.Namespace) -> None:
             "-e": ("explicit", "1"),
             "-z": ("zones", "0"),
             "-n": ("nonregular", "0"),
+            "-d": ("halo", "2"),
+            "-j": ("jobs", "1"),
+            "-k": ("link", "copy"),
+            "-x": ("binary", "0"),
         }
         invalid_options = [
             option
@@ -413,6 +496,7 @@ def check_cmdargs(cmdargs: argparse.Namespace) -> None:
             "-p": ("plot", "no"),
             "-t": ("transform", "0"),
             "-s": ("subfolders", "1"),
+            "-x": ("binary", "0"),
         }
         invalid_options = [
             option
@@ -435,6 +519,9 @@ def check_cmdargs(cmdargs: argparse.Namespace) -> None:
             "-e": ("explicit", "1"),
             "-z": ("zones", "0"),
             "-n": ("nonregular", "0"),
+            "-d": ("halo", "2"),
+            "-j": ("jobs", "1"),
+            "-k": ("link", "copy"),
         }
         invalid_options = [
             option
@@ -1,5 +1,6 @@
 <%
 import math as mt
+include, ext = ("IMPORT", "IMP") if dic["binary"] else ("INCLUDE", "INC")
 %>-- Copyright (C) 2023-2026 NORCE Research AS
 -- This deck was generated by expreccs https://github.com/cssr-tools/expreccs
 ----------------------------------------------------------------------------
@@ -39,8 +40,8 @@ GRID
 ----------------------------------------------------------------------------
 INIT
 
-INCLUDE
-'${reservoir.upper()}_GRID.INC' /
+${include}
+'${reservoir.upper()}_GRID.${ext}' /
 
 EQUALS
 % for i in range(dic[f'{reservoir}_num_cells'][2]):
@@ -176,8 +177,8 @@ ROCK
 ----------------------------------------------------------------------------
 REGIONS
 ----------------------------------------------------------------------------
-INCLUDE
-'${reservoir.upper()}_FIPNUM.INC' /
+${include}
+'${reservoir.upper()}_FIPNUM.${ext}' /
 % if len(dic['safu']) > 1:
 
 EQUALS
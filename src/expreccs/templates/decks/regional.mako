@@ -1,5 +1,6 @@
 <%
 import math as mt
+include, ext = ("IMPORT", "IMP") if dic["binary"] else ("INCLUDE", "INC")
 %>-- Copyright (C) 2023-2026 NORCE Research AS
 -- This deck was generated by expreccs https://github.com/cssr-tools/expreccs
 ----------------------------------------------------------------------------
@@ -39,8 +40,8 @@ GRID
 ----------------------------------------------------------------------------
 INIT
 
-INCLUDE
-'${relpath+reservoir.upper()}_GRID.INC' /
+${include}
+'${relpath+reservoir.upper()}_GRID.${ext}' /
 
 EQUALS
 % for i in range(dic[f'{reservoir}_num_cells'][2]):
@@ -121,11 +122,11 @@ ROCK
 ----------------------------------------------------------------------------
 REGIONS
 ----------------------------------------------------------------------------
-INCLUDE
-'${relpath+reservoir.upper()}_FIPNUM.INC' /
+${include}
+'${relpath+reservoir.upper()}_FIPNUM.${ext}' /
 
-INCLUDE
-'${relpath+reservoir.upper()}_OPERNUM.INC' /
+${include}
+'${relpath+reservoir.upper()}_OPERNUM.${ext}' /
 % if len(dic['safu']) > 1:
 
 EQUALS
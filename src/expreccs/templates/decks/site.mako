@@ -1,5 +1,6 @@
 <%
 import math as mt
+include, ext = ("IMPORT", "IMP") if dic["binary"] else ("INCLUDE", "INC")
 import numpy as np
 %>-- Copyright (C) 2023-2026 NORCE Research AS
 -- This deck was generated by expreccs https://github.com/cssr-tools/expreccs
@@ -46,8 +47,8 @@ GRID
 ----------------------------------------------------------------------------
 INIT
 
-INCLUDE
-'${inc.upper()}_GRID.INC' /
+${include}
+'${inc.upper()}_GRID.${ext}' /
 
 EQUALS
 % for i in range(dic[f'{reservoir}_num_cells'][2]):
@@ -88,17 +88,15 @@ def compute_multipliers(dic, iteration):  # pylint: disable=R1702,R0912,R0914,R0
     res = "site_" + dic["site_bctype"][0]
     for fol in dic["folders"]:
         if dic["site_bctype"][0] in ["porvproj", "pres"]:
+            case = f"{fol}/simulations/regional/REGIONAL"
+            mask = read_mask(case)
             case = f"{fol}/simulations/regional{iteration}/REGIONAL{iteration}"
-            rqs = read_fluxes(case)
+            rqs = read_fluxes(case, np.flatnonzero(mask))
             case = f"{fol}/simulations/{res}/{res.upper()}"
             lqs = read_fluxes(case)
-            case = f"{fol}/simulations/regional/REGIONAL"
-            mask = read_mask(case)
             for quantity, regional_arr, local_arr in zip(dic["quantity"], rqs, lqs):
 
-                regional_fluxes = sum(
-                    regional_arr[k][mask] for k in range(len(local_arr))
-                )
+                regional_fluxes = sum(regional_arr[k] for k in range(len(local_arr)))
                 local_fluxes = sum(local_arr[k] for k in range(len(local_arr)))
 
                 regional_fluxes, local_fluxes = np.abs(regional_fluxes), np.abs(
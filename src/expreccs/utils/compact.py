@@ -0,0 +1,37 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Utiliy function to write arrays in the 'n*x' notation of the include files"""
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+
+def compact_format(values: ArrayLike) -> list[str]:
+    """Use the 'n*x' notation to write repeated values to save storage
+
+    The runs are found on the whole array at once and each distinct value is
+    formatted only once; integer-valued entries are written without decimals
+    and the rest with the shortest float repr.
+    Strings (e.g., '1.000000E+00') are parsed as floats first.
+    """
+    values = np.asarray(values).ravel()
+    if values.dtype.kind not in "biuf":
+        values = values.astype(float)
+    if values.size == 0:
+        return []
+    starts = np.flatnonzero(np.concatenate(([True], values[1:] != values[:-1])))
+    counts = np.diff(np.append(starts, values.size))
+    unique, inverse = np.unique(values[starts], return_inverse=True)
+    if unique.dtype.kind == "f":
+        whole = (np.isfinite(unique) & (np.trunc(unique) == unique)).tolist()
+        texts = [
+            f"{int(val)} " if is_int else f"{val} "
+            for val, is_int in zip(unique.tolist(), whole)
+        ]
+    else:
+        texts = [f"{val} " for val in unique.astype(np.int64).tolist()]
+    return [
+        f"{n}*{texts[k]}" if n > 1 else texts[k]
+        for n, k in zip(counts.tolist(), inverse.ravel().tolist())
+    ]
@@ -0,0 +1,262 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+# pylint: disable=R0914
+
+"""Utiliy functions to extract the cell geometry from corner-point grid files"""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+from numpy.typing import NDArray
+from opm.io.ecl import EclFile as OpmFile
+from scipy.spatial import cKDTree  # pylint: disable=E0611
+
+
+@dataclass(slots=True)
+class Geometry:
+    """Cell geometry variables"""
+
+    dims: tuple[int, int, int]
+    coord: NDArray
+    zcorn: NDArray
+    mapaxes: NDArray
+    actnum: NDArray
+    centres: NDArray
+
+
+def grid_geometry(
+    egrid: str, cells: NDArray | None = None, chunk: int = 250000
+) -> Geometry:
+    """Decode COORD and ZCORN once into the cell centres
+
+    Args:
+        egrid: Path to the EGRID file
+        cells: Global indices of the cells to evaluate (all cells by default)
+        chunk: Number of cells to handle at once when evaluating the corners
+
+    Returns:
+        Geometry: Pillars, corners depths, and the centres of the given cells
+        (global indexing, nan for the cells not evaluated)
+
+    """
+    grid = OpmFile(egrid)
+    head = np.array(grid["GRIDHEAD"])
+    dims = (int(head[1]), int(head[2]), int(head[3]))
+    ncells = dims[0] * dims[1] * dims[2]
+    coord = np.array(grid["COORD"], dtype=float).reshape(-1, 6)
+    zcorn = np.array(grid["ZCORN"])
+    actnum = np.ones(ncells, dtype=int)
+    if grid.count("ACTNUM"):
+        actnum = np.array(grid["ACTNUM"])
+    mapaxes = np.array([])
+    if grid.count("MAPAXES"):
+        mapaxes = np.array(grid["MAPAXES"], dtype=float)
+    geom = Geometry(
+        dims,
+        coord,
+        zcorn,
+        mapaxes,
+        actnum,
+        np.full((ncells, 3), np.nan),
+    )
+    cell_centres(geom, np.arange(ncells) if cells is None else cells, chunk)
+    return geom
+
+
+def cell_centres(geom: Geometry, cells: NDArray, chunk: int = 250000) -> None:
+    """Evaluate the centres of the given cells in place"""
+    cells = np.asarray(cells, dtype=int)
+    for start in range(0, len(cells), chunk):
+        part = cells[start : start + chunk]
+        geom.centres[part] = np.mean(cell_corners(geom, part), axis=2)
+
+
+def window_centres(geom: Geometry, cells: NDArray) -> NDArray:
+    """Centres of the cells, evaluating the ones outside the evaluated window"""
+    cells = np.asarray(cells, dtype=int)
+    missing = cells[np.isnan(geom.centres[cells, 0])]
+    if missing.size:
+        cell_centres(geom, np.unique(missing))
+    return geom.centres[cells]
+
+
+def site_window(rgeom: Geometry, sgeom: Geometry, halo: int) -> NDArray:
+    """Regional cells in the columns around the site footprint
+
+    The footprint is the xy bounding box of the site pillars. The window
+    includes the regional columns with centres inside the footprint (or the
+    closest column for sites smaller than a regional cell), extended by halo
+    columns on each side. A negative halo returns all regional cells.
+    """
+    nx, ny, nz = rgeom.dims
+    if halo < 0:
+        return np.arange(nx * ny * nz)
+    sx, sy = pillars_xy(sgeom)
+    xmin, xmax, ymin, ymax = np.min(sx), np.max(sx), np.min(sy), np.max(sy)
+    rx, ry = pillars_xy(rgeom)
+    rx, ry = rx.reshape(ny + 1, nx + 1, 2), ry.reshape(ny + 1, nx + 1, 2)
+    cx = 0.125 * np.sum(rx[:-1, :-1] + rx[1:, :-1] + rx[:-1, 1:] + rx[1:, 1:], axis=2)
+    cy = 0.125 * np.sum(ry[:-1, :-1] + ry[1:, :-1] + ry[:-1, 1:] + ry[1:, 1:], axis=2)
+    inside = (cx >= xmin) & (cx <= xmax) & (cy >= ymin) & (cy <= ymax)
+    if not np.any(inside):
+        dist = (cx - 0.5 * (xmin + xmax)) ** 2 + (cy - 0.5 * (ymin + ymax)) ** 2
+        inside.flat[np.argmin(dist)] = True
+    jj, ii = np.nonzero(inside)
+    i_0, i_1, j_0, j_1 = int(ii.min()), int(ii.max()), int(jj.min()), int(jj.max())
+    i_s = np.arange(max(i_0 - halo, 0), min(i_1 + halo, nx - 1) + 1)
+    j_s = np.arange(max(j_0 - halo, 0), min(j_1 + halo, ny - 1) + 1)
+    cols = (j_s[:, None] * nx + i_s).ravel()
+    return (np.arange(nz)[:, None] * nx * ny + cols).ravel()
+
+
+def centres_tree(geom: Geometry, cells: NDArray) -> tuple[cKDTree, NDArray]:
+    """Tree on the centres of the cells, with the cells (global indices)"""
+    return cKDTree(window_centres(geom, cells)), cells
+
+
+def nearest_cells(
+    tree: cKDTree,
+    points: NDArray,
+    cells: NDArray,
+    full: Callable[[], tuple[cKDTree, NDArray]] | None = None,
+) -> NDArray:
+    """Global index of the closest cell to each point
+
+    The tree is built on the centres of the given cells (e.g., a regional
+    window). The points with equidistant closest cells are searched again in
+    the full tree (if given), so the picked cell is the same as a search over
+    all cells.
+    """
+    points = np.reshape(points, (-1, tree.m))
+    if full is None:
+        return cells[tree.query(points, workers=-1)[1]]
+    dist, idx = tree.query(points, k=2, workers=-1)
+    nearest = cells[idx[:, 0]]
+    ties = dist[:, 1] == dist[:, 0]
+    if np.any(ties):
+        tree_all, cells_all = full()
+        nearest[ties] = cells_all[tree_all.query(points[ties], workers=-1)[1]]
+    return nearest
+
+
+def active_indices(geom: Geometry) -> NDArray:
+    """Active index of each cell (-1 for the inactive cells)"""
+    active = geom.actnum > 0
+    return np.where(active, np.cumsum(active) - 1, -1)
+
+
+def neighbour_table(dims: tuple[int, int, int], cells: NDArray) -> NDArray:
+    """Global indices of the j-1, j+1, i-1, i+1, k-1, and k+1 neighbours
+
+    Returns:
+        NDArray: (cells x 6) table, with -1 for the neighbours outside the grid
+
+    """
+    nx, ny, nz = dims
+    cells = np.asarray(cells, dtype=int)
+    i, j, k = cells % nx, (cells // nx) % ny, cells // (nx * ny)
+    inside = np.column_stack((j > 0, j < ny - 1, i > 0, i < nx - 1, k > 0, k < nz - 1))
+    shifts = np.array([-nx, nx, -1, 1, -nx * ny, nx * ny])
+    return np.where(inside, cells[:, None] + shifts, -1)
+
+
+def cell_jitter(cells: NDArray, scale: float) -> NDArray:
+    """Deterministic offsets in [0, scale) derived from the global cell indices
+
+    The indices are mixed with the 64-bit finalizer of MurmurHash3, then
+    neighbouring cells get uncorrelated offsets, as with random noise, but the
+    same cell gets the same offset in every run and for any order of the cells.
+    """
+    x = np.asarray(cells, dtype=np.uint64)
+    x = x ^ (x >> np.uint64(33))
+    x = x * np.uint64(0xFF51AFD7ED558CCD)
+    x = x ^ (x >> np.uint64(33))
+    x = x * np.uint64(0xC4CEB9FE1A85EC53)
+    x = x ^ (x >> np.uint64(33))
+    return scale * (x >> np.uint64(11)).astype(float) / float(1 << 53)
+
+
+def pillars_xy(geom: Geometry) -> tuple[NDArray, NDArray]:
+    """The xy coordinates of the top and bottom points of the pillars"""
+    x, y = geom.coord[:, [0, 3]], geom.coord[:, [1, 4]]
+    if geom.mapaxes.size:
+        x, y = mapaxes_transform(geom.mapaxes, x, y)
+    return x, y
+
+
+def cell_corners(geom: Geometry, cells: NDArray) -> NDArray:
+    """The xyz coordinates of the 8 corners of the given cells
+
+    The corners are ordered as in opm.io.ecl.EGrid.xyz_from_ijk (top face
+    i,j/i+1,j/i,j+1/i+1,j+1, then the bottom face), i.e., the returned array
+    (cells x 3 x 8) matches stacking its output for each global index.
+    """
+    nx, ny, _ = geom.dims
+    cells = np.asarray(cells, dtype=int)
+    i, j, k = cells % nx, (cells // nx) % ny, cells // (nx * ny)
+    corner = np.arange(8)
+    dis, djs, dks = corner % 2, (corner // 2) % 2, corner // 4
+    zind = (
+        (2 * i)[:, None]
+        + dis
+        + 2 * nx * ((2 * j)[:, None] + djs)
+        + 4 * nx * ny * ((2 * k)[:, None] + dks)
+    )
+    zcr = geom.zcorn[zind].astype(float)
+    pil = geom.coord[(j[:, None] + djs) * (nx + 1) + i[:, None] + dis]
+    xtop, ytop, ztop = pil[..., 0], pil[..., 1], pil[..., 2]
+    xbot, ybot, zbot = pil[..., 3], pil[..., 4], pil[..., 5]
+    vertical = ztop == zbot
+    dzp = np.where(vertical, 1.0, ztop - zbot)
+    xcr = np.where(vertical, xtop, xtop + (xbot - xtop) / dzp * (ztop - zcr))
+    ycr = np.where(vertical, ytop, ytop + (ybot - ytop) / dzp * (ztop - zcr))
+    if geom.mapaxes.size:
+        xcr, ycr = mapaxes_transform(geom.mapaxes, xcr, ycr)
+    return np.stack((xcr, ycr, zcr), axis=1)
+
+
+def mapaxes_transform(
+    mapaxes: NDArray, x: NDArray, y: NDArray
+) -> tuple[NDArray, NDArray]:
+    """Map the grid coordinates to the MAPAXES coordinates"""
+    origin = mapaxes[2:4]
+    unit_x = mapaxes[4:6] - origin
+    unit_y = mapaxes[0:2] - origin
+    unit_x /= np.linalg.norm(unit_x)
+    unit_y /= np.linalg.norm(unit_y)
+    return (
+        origin[0] + x * unit_x[0] + y * unit_y[0],
+        origin[1] + x * unit_x[1] + y * unit_y[1],
+    )
+
+
+def segments_intersect(
+    p_0: NDArray, p_1: NDArray, q_0: NDArray, q_1: NDArray
+) -> NDArray:
+    """Check if the xy segments p_0-p_1 intersect the segments q_0-q_1
+
+    Touching and collinear overlapping segments count as intersecting, as in
+    shapely's intersects. The arguments broadcast, e.g., (n,2) arrays of
+    segments against one (2,) segment.
+    """
+
+    def orientation(a, b, c):
+        return np.sign(
+            (b[..., 0] - a[..., 0]) * (c[..., 1] - a[..., 1])
+            - (b[..., 1] - a[..., 1]) * (c[..., 0] - a[..., 0])
+        )
+
+    overlap = np.ones(np.broadcast_shapes(p_0.shape, q_0.shape)[:-1], dtype=bool)
+    for axis in range(2):
+        overlap &= np.minimum(p_0[..., axis], p_1[..., axis]) <= np.maximum(
+            q_0[..., axis], q_1[..., axis]
+        )
+        overlap &= np.minimum(q_0[..., axis], q_1[..., axis]) <= np.maximum(
+            p_0[..., axis], p_1[..., axis]
+        )
+    return (
+        overlap
+        & (orientation(p_0, p_1, q_0) * orientation(p_0, p_1, q_1) <= 0)
+        & (orientation(q_0, q_1, p_0) * orientation(q_0, q_1, p_1) <= 0)
+    )
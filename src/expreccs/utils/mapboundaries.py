@@ -11,97 +11,35 @@ from alive_progress import alive_bar
 from opm.io.ecl import EclFile as OpmFile
 from opm.io.ecl import EGrid as OpmGrid
 from scipy.interpolate import RegularGridInterpolator, interp1d
-from shapely.geometry import Point
+from shapely import contains_xy
 from shapely.geometry.polygon import Polygon
 
+from expreccs.utils.restart import RestartReader
+
 
 def porv_regional_segmentation(dic):
     """Locate the different sides for the pv projections"""
-    dic["regional_opernum"] = []
-
-    poly2 = Polygon(
-        [
-            (0, 0),
-            (dic["site_location"][0], dic["site_location"][1]),
-            (dic["site_location"][3], dic["site_location"][1]),
-            (dic["reference_dims"][0], 0),
-        ]
-    )
-    poly3 = Polygon(
-        [
-            (dic["reference_dims"][0], 0),
-            (dic["site_location"][3], dic["site_location"][1]),
-            (dic["site_location"][3], dic["site_location"][4]),
-            (dic["reference_dims"][0], dic["reference_dims"][1]),
-        ]
-    )
-    poly4 = Polygon(
-        [
-            (dic["reference_dims"][0], dic["reference_dims"][1]),
-            (dic["site_location"][3], dic["site_location"][4]),
-            (dic["site_location"][0], dic["site_location"][4]),
-            (0, dic["reference_dims"][1]),
-        ]
-    )
-    poly5 = Polygon(
-        [
-            (0, dic["reference_dims"][1]),
-            (dic["site_location"][0], dic["site_location"][4]),
-            (dic["site_location"][0], dic["site_location"][1]),
-            (0, 0),
-        ]
-    )
-    poly6 = Polygon(
-        [
-            (dic["site_location"][3], 0),
-            (dic["site_location"][3], dic["site_location"][1]),
-            (dic["reference_dims"][0], dic["site_location"][1]),
-            (dic["reference_dims"][0], 0),
-        ]
-    )
-    poly7 = Polygon(
-        [
-            (dic["site_location"][3], dic["site_location"][4]),
-            (dic["site_location"][3], dic["reference_dims"][1]),
-            (dic["reference_dims"][0], dic["reference_dims"][1]),
-            (dic["reference_dims"][0], dic["site_location"][4]),
-        ]
-    )
-    poly8 = Polygon(
-        [
-            (0, dic["site_location"][4]),
-            (dic["site_location"][0], dic["site_location"][4]),
-            (dic["site_location"][0], dic["reference_dims"][1]),
-            (0, dic["reference_dims"][1]),
-        ]
-    )
-
-    for _, z_c in enumerate(dic["regional_zmz_mid"]):
-        for _, y_c in enumerate(dic["regional_ymy_mid"]):
-            for _, x_c in enumerate(dic["regional_xmx_mid"]):
-                if (
-                    dic["site_location"][2] <= z_c <= dic["site_location"][5]
-                    and dic["site_location"][1] <= y_c <= dic["site_location"][4]
-                ) and dic["site_location"][0] <= x_c <= dic["site_location"][3]:
-                    dic["regional_opernum"].append("1 ")
-                else:
-                    point = Point(x_c, y_c)
-                    if poly2.contains(point):
-                        dic["regional_opernum"].append("2 ")
-                    elif poly3.contains(point):
-                        dic["regional_opernum"].append("3 ")
-                    elif poly4.contains(point):
-                        dic["regional_opernum"].append("4 ")
-                    elif poly5.contains(point):
-                        dic["regional_opernum"].append("5 ")
-                    elif poly6.contains(point):
-                        dic["regional_opernum"].append("6 ")
-                    elif poly7.contains(point):
-                        dic["regional_opernum"].append("7 ")
-                    elif poly8.contains(point):
-                        dic["regional_opernum"].append("8 ")
-                    else:
-                        dic["regional_opernum"].append("9 ")
+    loc, dims = dic["site_location"], dic["reference_dims"]
+    polygons = [
+        [(0, 0), (loc[0], loc[1]), (loc[3], loc[1]), (dims[0], 0)],
+        [(dims[0], 0), (loc[3], loc[1]), (loc[3], loc[4]), (dims[0], dims[1])],
+        [(dims[0], dims[1]), (loc[3], loc[4]), (loc[0], loc[4]), (0, dims[1])],
+        [(0, dims[1]), (loc[0], loc[4]), (loc[0], loc[1]), (0, 0)],
+        [(loc[3], 0), (loc[3], loc[1]), (dims[0], loc[1]), (dims[0], 0)],
+        [(loc[3], loc[4]), (loc[3], dims[1]), (dims[0], dims[1]), (dims[0], loc[4])],
+        [(0, loc[4]), (loc[0], loc[4]), (loc[0], dims[1]), (0, dims[1])],
+    ]
+    x_c, y_c = np.meshgrid(dic["regional_xmx_mid"], dic["regional_ymy_mid"])
+    z_c = np.asarray(dic["regional_zmz_mid"])
+
+    sides = np.full(x_c.shape, 9, dtype=np.int8)
+    for label, polygon in reversed(list(enumerate(polygons, start=2))):
+        sides[contains_xy(Polygon(polygon), x_c, y_c)] = label
+    site_xy = (loc[1] <= y_c) & (y_c <= loc[4]) & (loc[0] <= x_c) & (x_c <= loc[3])
+    site_z = (loc[2] <= z_c) & (z_c <= loc[5])
+    dic["regional_opernum"] = np.where(
+        site_z[:, None, None] & site_xy, np.int8(1), sides
+    ).ravel()
 
 
 def porv_projections(dic):
@@ -150,7 +88,8 @@ def aquaflux(dic, iteration=""):
     dic["regza"] = np.any(porv_rsh > 0, axis=(1, 2)).tolist()
 
     case = f"{dic['fol']}/simulations/regional{iteration}/REGIONAL{iteration}"
-    dic["rst"], dic["grid"] = OpmFile(case + ".UNRST"), OpmGrid(case + ".EGRID")
+    dic["rst"] = RestartReader(case + ".UNRST")
+    dic["grid"] = OpmGrid(case + ".EGRID")
 
     idx0 = dic["grid"].active_index(
         dic["site_corners"][0][0], dic["site_corners"][0][1], dic["site_corners"][0][2]
@@ -213,6 +152,7 @@ def aquaflux(dic, iteration=""):
         dic[keyword] = [[] for _ in range(len(dic["schedule_r"]))]
 
     cache_grid_coordinates(dic)
+    gcells, acells = stencil_cells(dic)
 
     xsize = dic["regional_xmx_dsize"]
     ysize = dic["regional_ymy_dsize"]
@@ -226,7 +166,7 @@ def aquaflux(dic, iteration=""):
 
             for keyword in ["FLOWATI+", "FLOWATJ+", "PRESSURE", "WAT_DEN"]:
                 arr = np.zeros_like(dic["porvr"])
-                arr[dic["actindr"]] = np.array(dic["rst"][keyword, i])
+                arr[gcells] = dic["rst"].gather(keyword, i, acells)
                 dic[keyword][i] = [arr]
 
             if dic["site_bctype"][0] == "flux":
@@ -262,6 +202,19 @@ def aquaflux(dic, iteration=""):
         handle_pressure_correction(dic)
 
 
+def stencil_cells(dic):
+    """Global and active indices of the boundary cells and their neighbours"""
+    nx = dic["regional_num_cells"][0]
+    cells = np.concatenate(
+        [dic[f"cells_{name}"] for name in ["bottom", "top", "left", "right"]]
+    )
+    shifts = (np.arange(-1, 2)[:, None] * nx + np.arange(-1, 2)).ravel()
+    cells = np.unique(cells[:, None] + shifts)
+    cells = cells[(cells >= 0) & (cells < dic["porvr"].size)]
+    cells = cells[dic["actindr"][cells]]
+    return cells, np.cumsum(dic["actindr"])[cells] - 1
+
+
 def handle_pressure_correction(dic):
     """Correct for the REG pres to the SITE on the z dir if refinement"""
     for i in range(len(dic["schedule_r"])):
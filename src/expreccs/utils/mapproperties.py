@@ -109,71 +109,33 @@ def rotate_grid(dic):
     dic["site_xc"], dic["site_yc"] = np.array(dic["site_xc"]), np.array(dic["site_yc"])
 
 
-def positions_regional(dic):
-    """Locate well, site, and fault positions"""
-    dic["regional_fipnum"] = []
-    dic["site_corners"] = [[-1, -1, 0], [-1, -1, 0]]
-    dic["asleft"], dic["asright"], dic["asbottom"], dic["astop"] = (
-        True,
-        True,
-        True,
-        True,
+def site_box(dic, res):
+    """Mask of the cell centres inside the site box, ordered as (z, y, x)"""
+    loc = dic["site_location"]
+    x_c, y_c, z_c = (dic[f"{res}_{name}_mid"] for name in ["xmx", "ymy", "zmz"])
+    return (
+        ((loc[2] <= z_c) & (z_c <= loc[5]))[:, None, None]
+        & ((loc[1] <= y_c) & (y_c <= loc[4]))[None, :, None]
+        & ((loc[0] <= x_c) & (x_c <= loc[3]))[None, None, :]
     )
-    indx, indc, lasti, found = 0, 0, 0, False
-
-    for _, z_c in enumerate(dic["regional_zmz_mid"]):
-        for j, y_c in enumerate(dic["regional_ymy_mid"]):
-            row_has_site = False
-            for i, x_c in enumerate(dic["regional_xmx_mid"]):
-                inside = (
-                    dic["site_location"][0] <= x_c <= dic["site_location"][3]
-                    and dic["site_location"][1] <= y_c <= dic["site_location"][4]
-                    and dic["site_location"][2] <= z_c <= dic["site_location"][5]
-                )
-                if inside:
-                    dic["regional_fipnum"].append("1 ")
-                    lasti = i
-                    row_has_site = True
-                    if dic["site_corners"][0][0] == -1:
-                        dic["site_corners"][0] = [i, j, 0]
-                else:
-                    dic["regional_fipnum"].append("2 ")
-                indx += 1
-            if row_has_site:
-                indc = j
-            elif indc != 0 and not row_has_site:
-                dic["site_corners"][1] = [lasti, j - 1, 0]
-                indc = 0
-                found = True
-            if (
-                j == len(dic["regional_ymy_mid"]) - 1
-                and not found
-                and dic["site_corners"][0][0] != -1
-            ):
-                dic["site_corners"][1] = [lasti, j, 0]
 
+
+def positions_regional(dic):
+    """Locate well, site, and fault positions"""
+    inside = site_box(dic, "regional")
+    dic["regional_fipnum"] = np.where(inside, np.int8(1), np.int8(2)).ravel()
     nx, ny = dic["regional_num_cells"][:2]
+    ijk = np.argwhere(inside)
+    if len(ijk):
+        j0, i0 = (int(val) for val in ijk[:, 1:].min(axis=0))
+        j1, i1 = (int(val) for val in ijk[:, 1:].max(axis=0))
+        dic["site_corners"] = [[i0, j0, 0], [i1, j1, 0]]
+    else:
+        dic["site_corners"] = [[-1, -1, 0], [nx - 1, ny - 1, 0]]
     i0, j0, _ = dic["site_corners"][0]
     i1, j1, _ = dic["site_corners"][1]
-    if i0 == 0:
-        dic["asleft"] = False
-    if j0 == 0:
-        dic["asbottom"] = False
-    if i1 == nx - 1:
-        dic["asright"] = False
-    if i1 == -1:
-        for k in range(nx - 1, -1, -1):
-            if dic["regional_fipnum"][-nx + k] == "1 ":
-                dic["site_corners"][1][0] = k
-                break
-        else:
-            dic["site_corners"][1][0] = nx - 1
-            dic["asright"] = False
-    if j1 == ny - 1:
-        dic["astop"] = False
-    if j1 == -1:
-        dic["astop"] = False
-        dic["site_corners"][1][1] = ny - 1
+    dic["asleft"], dic["asright"] = i0 != 0, i1 != nx - 1
+    dic["asbottom"], dic["astop"] = j0 != 0, j1 != ny - 1
 
     dic["regional_wellijk"] = [[] for _ in range(len(dic["well_coords"]))]
     dic["regional_fault"], dic["regional_sensor"] = [0, 0, 0], [0, 0, 0]
@@ -207,9 +169,7 @@ def positions_regional(dic):
 
 def positions_rotation(dic):
     """Find the locations after the rotation"""
-    dic["site_fipnum"] = ["1 "] * (
-        dic["site_num_cells"][0] * dic["site_num_cells"][1] * dic["site_num_cells"][2]
-    )
+    dic["site_fipnum"] = np.ones(np.prod(dic["site_num_cells"]), dtype=np.int8)
     dic["site_wellijk"] = []
     dic["site_sensor"] = [0, 0, 0]
     dic["site_fault"] = [[0, 0, 0], [0, 0, 0]]
@@ -254,9 +214,7 @@ def positions_rotation(dic):
 
 def positions_site(dic):
     """Locate well and fault positions in the site reservoir"""
-    dic["site_fipnum"] = ["1 "] * (
-        dic["site_num_cells"][0] * dic["site_num_cells"][1] * dic["site_num_cells"][2]
-    )
+    dic["site_fipnum"] = np.ones(np.prod(dic["site_num_cells"]), dtype=np.int8)
     dic["site_wellijk"] = []
     dic["site_sensor"] = [0, 0, 0]
     dic["site_fault"] = [[0, 0, 0], [0, 0, 0]]
@@ -298,17 +256,9 @@ def positions_site(dic):
 
 def positions_reference(dic):
     """Locate well, fault, and site positions in the reference reservoir"""
-    dic["reference_fipnum"] = []
-    for k in dic["reference_zmz_mid"]:
-        for j in dic["reference_ymy_mid"]:
-            for i in dic["reference_xmx_mid"]:
-                if (
-                    dic["site_location"][0] <= i <= dic["site_location"][3]
-                    and dic["site_location"][1] <= j <= dic["site_location"][4]
-                ) and dic["site_location"][2] <= k <= dic["site_location"][5]:
-                    dic["reference_fipnum"].append("1 ")
-                else:
-                    dic["reference_fipnum"].append("2 ")
+    dic["reference_fipnum"] = np.where(
+        site_box(dic, "reference"), np.int8(1), np.int8(2)
+    ).ravel()
 
     dic["reference_wellijk"] = [[] for _ in range(len(dic["well_coords"]))]
     dic["reference_fault"] = [0, 0, 0]
@@ -6,25 +6,58 @@
 regional and site decks"""
 
 import csv
+import hashlib
 import os
+import shutil
 import sys
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from contextlib import nullcontext
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
+from functools import partial
+from itertools import islice
 
 import numpy as np
 from alive_progress import alive_bar
 from numpy.typing import NDArray
 from opm.io.ecl import EclFile as OpmFile
 from opm.io.ecl import EGrid as OpmGrid
-from opm.io.ecl import ERst as OpmRestart
-from scipy.interpolate import LinearNDInterpolator, interp1d
-from scipy.spatial import cKDTree
-from shapely.geometry import LineString, Point, Polygon
+from scipy.sparse import csr_matrix
+from scipy.spatial import Delaunay, cKDTree  # pylint: disable=E0611
+from shapely import contains_xy
+from shapely.geometry import Polygon
+
+from expreccs.utils.compact import compact_format
+from expreccs.utils.geometry import (
+    Geometry,
+    active_indices,
+    cell_corners,
+    cell_jitter,
+    centres_tree,
+    grid_geometry,
+    nearest_cells,
+    neighbour_table,
+    segments_intersect,
+    site_window,
+    window_centres,
+)
+from expreccs.utils.restart import RestartReader
 
 HEADER = (
     "-- Copyright (C) 2025-2026 NORCE Research AS\n"
     "-- This deck was generated by expreccs https://github.com/cssr-tools/expreccs\n"
 )
+CACHE = "expreccs_cache.npz"
+STATE = "expreccs_state.npz"
+CACHE_VERSION = 2
+FACE = np.dtype(
+    [("id", int), ("i", int), ("j", int), ("k", int), ("dir", "U2"), ("active", bool)]
+)
+GENERATED = ("BCCON.INC", "OPERNUM_EXPRECCS.INC")
+MOORE = [(-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1)]
+WORKER: dict = {}
+DIGESTS: dict[str, tuple[tuple[int, int], bytes]] = {}
 
 # fmt: off
 @dataclass(slots=True)
@@ -32,10 +65,12 @@ class Regional:
     """Regional variables"""
     grid: OpmGrid
     init: OpmFile
-    rst: OpmRestart
+    rst: RestartReader
     rfip: NDArray
     act: NDArray
     rdays: NDArray
+    geom: Geometry
+    window: NDArray
 
 
 @dataclass(slots=True)
@@ -43,9 +78,10 @@ class Site:
     """Site variables"""
     grid: OpmGrid
     init: OpmFile
-    rst: OpmRestart
+    rst: RestartReader
     sfip: NDArray
     sdata: str
+    geom: Geometry
 
 @dataclass(slots=True)
 class Config:
@@ -68,23 +104,43 @@ class InterpData:
     sf: list[list[int]]; st: list[list[float]]
     sai: list[int]; snum: list[int]
 
+@dataclass(slots=True)
+class Projection:
+    """Projection operator variables"""
+    keys: list[int]
+    pres: csr_matrix
+    pcols: NDArray
+    dens: csr_matrix
+    dcols: NDArray
+    pressure0: NDArray
+
+@dataclass(slots=True)
+class Operators:
+    """Static boundary operator variables"""
+    proj: Projection
+    sbound: NDArray
+    spres: NDArray
+    sopn: NDArray
+    oprn: NDArray
+    fipn: NDArray
+
 @dataclass(slots=True)
 class XYMaps:
     """XYMaping variables"""
     x_i: NDArray
     y_i: NDArray
     z_i: NDArray
-    inds: list[int]
+    inds: NDArray
     fipr: NDArray
-    offset: list[float]
+    offset: NDArray
     oprn: NDArray
     rtmin: float
 
 @dataclass(slots=True)
 class BCCon:
     """Boundary variables"""
-    coords: list[list[float]]
-    sbound: list[str]
+    coords: NDArray
+    sbound: NDArray
     spres: list[float]
     ksfips: list[int]
     stmin: float
@@ -95,7 +151,7 @@ class Borders:
     """Border variables"""
     sx: list[list[float]]; sy: list[list[float]]; sz: list[list[float]]
     sf: list[list[int]]; st: list[list[float]]
-    sbound: list[str]
+    sbound: NDArray
     sai: list[int]
 
 @dataclass(slots=True)
@@ -103,14 +159,15 @@ class RegionalCells:
     """Regional variables"""
     ri:list;rx:list;ry:list;rz:list
     rf:list[NDArray];rt:list;rk:list;rkg: list[list[tuple[float, int]]]
-    sbound:list[str]
+    sbound:NDArray
+    oprn:NDArray;fipn:NDArray
 
 @dataclass(slots=True)
 class SiteBorders:
     """Site variables"""    
     spres: list[float]
     sai: list[int]
-    sbound: list[str]
+    sbound: NDArray
     sxn: list[float]; syn: list[float]; szn: list[float]; sfn: list[int]; stn: list[float]
     sxw: list[float]; syw: list[float]; szw: list[float]; sfw: list[int]; stw: list[float]
     sxs: list[float]; syl: list[float]; szs: list[float]; sfs: list[int]; sts: list[float]
@@ -130,40 +187,25 @@ def create_deck(
     freg: str,
     sit: str,
     fsit: str,
+    halo: int = 2,
+    jobs: int = 1,
+    shared: Regional | None = None,
+    link: str = "copy",
 ) -> None:
-    """Main orchestration of the hirerchical expreccs approach"""
-    if zones:
-        explicit = False
+    """Main orchestration of the hirerchical expreccs approach
 
-    case = f"{freg}/{reg}"
-    rrst, rgrid = OpmRestart(case + ".UNRST"), OpmGrid(case + ".EGRID")
-    rinit = OpmFile(case + ".INIT")
-
-    case = f"{fsit}/{sit}"
-    srst, sgrid, sinit = (
-        OpmRestart(case + ".UNRST"),
-        OpmGrid(case + ".EGRID"),
-        OpmFile(case + ".INIT"),
-    )
-    sdata = case + ".DATA"
-
-    rdim, sdim = rgrid.dimension, sgrid.dimension
-    rfip = np.ones(np.prod(rdim))
-    sfip = np.ones(np.prod(sdim))
-    ufip = np.array([1])
-
-    ract = np.array(rinit["PORV"]) > 0
+    If shared is given, the regional files already opened in it are reused and
+    the regional include files are written in fol (see create_decks).
+    """
     if zones:
-        rfip = np.array(rinit["FIPNUM"])
-        sfip = np.array(sinit["FIPNUM"])
-        ufip = np.intersect1d(np.unique(rfip), np.unique(sfip))
-
-    rdays = np.array([rrst["DOUBHEAD", i][0] for i in range(len(rrst))])
-    sdays = np.array([rrst["DOUBHEAD", i][0] for i in range(len(rrst))])
-    isdays = np.array([rrst["DOUBHEAD", i][0] for i in range(len(rrst))])
+        explicit = False
 
-    site = Site(sgrid, sinit, srst, sfip, sdata)
-    regional = Regional(rgrid, rinit, rrst, rfip, ract, rdays)
+    if shared is None:
+        rrst = RestartReader(f"{freg}/{reg}.UNRST")
+        rdays = np.array([rrst["DOUBHEAD", i][0] for i in range(len(rrst))])
+    else:
+        rrst, rdays = shared.rst, shared.rdays
+    sdays, isdays = rdays.copy(), rdays.copy()
 
     if len(freq) < len(isdays) - 2:
         freq = np.array([int(freq[0])] * (len(isdays) - 1))
@@ -178,171 +220,174 @@ def create_deck(
     if np.max(freq) <= 0:
         sdays = np.array([])
 
-    sopn = np.zeros(np.prod(sdim))
-
     if not os.path.exists(fol):
         os.makedirs(fol, exist_ok=True)
     if not os.path.exists(f"{fol}/bc") and np.max(freq) > 0:
         os.makedirs(fol + "/bc", exist_ok=True)
 
-    mly, mlx = find_ij_orientation(sgrid)
+    options = (boundaries, zones, explicit, nonregular, halo)
+    key = cache_key(
+        [f"{freg}/{reg}", f"{fsit}/{sit}"], options, [f"{fsit}/{sit}.UNRST"]
+    )
+    ops = load_cache(f"{fol}/{CACHE}", key, rrst, explicit)
+    if ops is None:
+        ops = boundary_operators(
+            shared or load_regional(reg, freg, rrst),
+            explicit,
+            zones,
+            nonregular,
+            boundaries,
+            sit,
+            fsit,
+            halo,
+        )
+        save_cache(f"{fol}/{CACHE}", key, ops)
+    else:
+        print(f"\nUsing the cached boundary operators in {fol}/{CACHE}")
+    if shared is None:
+        write_operator_includes(ops, freg, nonregular)
+    else:
+        write_operator_includes(ops, freg, nonregular, fol)
 
-    rp: list[list[tuple[int, float]]] = [[] for _ in range(len(rrst))]
+    sdays, ddays = temporal_interpolation(freq, acoeff, sdays, isdays, rdays)
 
-    if nonregular:
-        start_point = []
-        actnum = np.array(sinit["PORV"]) > 0
-        if sdim[2] == 1:
-            grid = actnum.reshape(sdim[1], sdim[0])
-        else:
-            tmp0 = []
-            for j in range(sdim[1]):
-                for i in range(sdim[0]):
-                    tmp0.append(0)
-                    for k in range(sdim[2]):
-                        ind = i + j * sdim[0] + k * sdim[0] * sdim[1]
-                        if actnum[ind] > 0:
-                            tmp0[-1] = 1
-                            break
-            grid = np.array(tmp0).reshape(sdim[1], sdim[0])
-        for j in range(sdim[1]):
-            for i in range(sdim[0]):
-                if grid[j][i]:
-                    start_point = [j, i]
-                    break
-            if start_point:
-                break
-        boundary, dire = site_contour(grid, start_point)
-
-        bc = get_bccon(
-            site, regional, boundaries, explicit, np.array(boundary), dire, sopn
+    write_files(
+        fol, fsit, freq, ddays, f"{fsit}/{sit}.DATA", ops.sbound, ops.sopn, link
+    )
+
+    first = written_times(f"{fol}/{STATE}", fol, key, rrst, ops.proj, rdays, sdays)
+    if first:
+        print(f"\nReusing the BCPROP files of the first {first} site report steps")
+    # the state is written again only once all the BCPROP files are written, so
+    # an interrupted run does not leave a state of files that were overwritten
+    if os.path.isfile(f"{fol}/{STATE}"):
+        os.remove(f"{fol}/{STATE}")
+    write_bcprop(
+        fol, rrst, ops.proj, explicit, rdays, sdays, ops.spres, jobs=jobs, first=first
+    )
+    save_state(f"{fol}/{STATE}", key, rrst, ops.proj, rdays, sdays)
+
+
+def create_decks(
+    fol: str,
+    explicit: bool,
+    zones: bool,
+    freq: NDArray,
+    nonregular: bool,
+    acoeff: NDArray,
+    boundaries: list[int],
+    reg: str,
+    freg: str,
+    sites: list[tuple[str, str]],
+    halo: int = 2,
+    jobs: int = 1,
+    link: str = "copy",
+) -> None:
+    """Project the same regional model to several (site, site folder) decks
+
+    The regional grid, restart, and evaluated cell centres are loaded once,
+    and the files of each site are written in fol/<site folder name>.
+    """
+    shared = load_regional(reg, freg)
+    for sit, fsit in sites:
+        print(f"\nSite {fsit}/{sit}:")
+        create_deck(
+            f"{fol}/{os.path.basename(fsit)}",
+            explicit,
+            zones,
+            freq,
+            nonregular,
+            acoeff,
+            boundaries,
+            reg,
+            freg,
+            sit,
+            fsit,
+            halo,
+            jobs,
+            shared,
+            link,
         )
 
-        coords = bc.coords
-        sbound = bc.sbound
-        spres = bc.spres
-        ksfips = bc.ksfips
-        stmin = bc.stmin
-        sopn = bc.sopn
 
-        xy = get_xymaps(regional, ufip, zones, coords)
+def load_regional(reg: str, freg: str, rrst: RestartReader | None = None) -> Regional:
+    """Open the regional files once, to be shared between the sites"""
+    case = f"{freg}/{reg}"
+    rgrid = OpmGrid(case + ".EGRID")
+    rinit = OpmFile(case + ".INIT")
+    if rrst is None:
+        rrst = RestartReader(case + ".UNRST")
+    rdays = np.array([rrst["DOUBHEAD", i][0] for i in range(len(rrst))])
+    return Regional(
+        rgrid,
+        rinit,
+        rrst,
+        np.ones(np.prod(rgrid.dimension)),
+        np.array(rinit["PORV"]) > 0,
+        rdays,
+        grid_geometry(case + ".EGRID", np.array([], dtype=int)),
+        np.array([], dtype=int),
+    )
 
-        x_i = xy.x_i
-        y_i = xy.y_i
-        z_i = xy.z_i
-        inds = xy.inds
-        fipr = xy.fipr
-        offset = xy.offset
-        oprn = xy.oprn
-        rtmin = xy.rtmin
 
-        with open(f"{freg}/OPERNUM_EXPRECCS.INC", "w", encoding="utf8") as f:
-            f.write(HEADER)
-            f.write("OPERNUM\n")
-            f.write("".join(compact_format_numeric(oprn)))
-            f.write("/\n")
+def boundary_operators(
+    shared: Regional,
+    explicit: bool,
+    zones: bool,
+    nonregular: bool,
+    boundaries: list[int],
+    sit: str,
+    fsit: str,
+    halo: int,
+) -> Operators:
+    """Build the static (time independent) part of the boundary projections"""
+    rgrid, rinit, rrst, rgeom = shared.grid, shared.init, shared.rst, shared.geom
 
-        tmp = sbound.copy()
-        if sbound:
-            print("Dynamic interpolator:")
-        z0 = np.array(rrst["PRESSURE", 0])
-        coords_arr = np.array(coords)
-
-        with alive_bar(len(rrst)) as bar_animation:
-            for i in range(len(rrst)):
-                if not sbound:
-                    break
-                bar_animation()
-                z_p_full = np.array(rrst["PRESSURE", i])
-                if not explicit:
-                    z_p = (z_p_full - z0)[inds]
-                else:
-                    if rrst.count("WAT_DEN", i):
-                        den = 9.81 * rrst["WAT_DEN", i] / 1e5
-                    else:
-                        den = 9.81 * 1000.0 * (z_p_full > 0) / 1e5
-                    z_p = np.array(
-                        [
-                            z_p_full[ind] + den[ind] * offset[j]
-                            for j, ind in enumerate(inds)
-                        ]
-                    )
+    case = f"{fsit}/{sit}"
+    srst, sgrid, sinit = (
+        RestartReader(case + ".UNRST"),
+        OpmGrid(case + ".EGRID"),
+        OpmFile(case + ".INIT"),
+    )
+    sdata, sgeom = case + ".DATA", grid_geometry(case + ".EGRID")
 
-                count, n = 0, -1
-                interp = LinearNDInterpolator(list(zip(x_i, y_i, z_i)), z_p)
-                coords_eval = coords_arr.copy()
-                if zones:
-                    coords_eval[:, 2] += np.round(rtmin - stmin, 2)
+    rwin = site_window(rgeom, sgeom, halo)
+    rnear = site_window(rgeom, sgeom, halo + 1) if halo > -1 else rwin
+    window_centres(rgeom, site_window(rgeom, sgeom, halo + 2) if halo > -1 else rwin)
 
-                vals = interp(coords_eval)
+    sdim = sgrid.dimension
+    rfip = shared.rfip
+    sfip = np.ones(np.prod(sdim))
+    ufip = np.array([1])
 
-                for idx, _ in enumerate(coords):
-                    edit = sbound[count].split() if i == 0 else tmp[count].split()
-                    val = vals[idx]
-                    if zones:
-                        zone_key = ksfips[int(edit[5]) - 1]
-                        if n != zone_key:
-                            n = zone_key
-                            whr = fipr == n
-                            if np.any(whr):
-                                interp = LinearNDInterpolator(
-                                    list(zip(x_i[whr], y_i[whr], z_i[whr])), z_p[whr]
-                                )
-                                vals = interp(coords_eval)
-                        if not np.any(whr):
-                            if i == 0:
-                                sopn[
-                                    sgrid.global_index(
-                                        int(edit[1]) - 1,
-                                        int(edit[3]) - 1,
-                                        int(edit[5]) - 1,
-                                    )
-                                ] = -1
-                                sbound.pop(count)
-                                if not explicit:
-                                    spres.pop(count)
-                        else:
-                            if not np.isnan(val):
-                                count += 1
-                                rp[i].append((count, val))
-                                if i == 0:
-                                    edit[0] = str(count)
-                                    sbound[count - 1] = " ".join(edit)
-                            else:
-                                if i == 0:
-                                    sopn[
-                                        sgrid.global_index(
-                                            int(edit[1]) - 1,
-                                            int(edit[3]) - 1,
-                                            int(edit[5]) - 1,
-                                        )
-                                    ] = -1
-                                    sbound.pop(count)
-                                    if not explicit:
-                                        spres.pop(count)
-                    else:
-                        if not np.isnan(val):
-                            count += 1
-                            rp[i].append((count, val))
-                            if i == 0:
-                                edit[0] = str(count)
-                                sbound[count - 1] = " ".join(edit)
-                        else:
-                            if i == 0:
-                                sopn[
-                                    sgrid.global_index(
-                                        int(edit[1]) - 1,
-                                        int(edit[3]) - 1,
-                                        int(edit[5]) - 1,
-                                    )
-                                ] = -1
-                                sbound.pop(count)
-                                if not explicit:
-                                    spres.pop(count)
+    ract = shared.act
+    if zones:
+        rfip = np.array(rinit["FIPNUM"])
+        sfip = np.array(sinit["FIPNUM"])
+        ufip = np.intersect1d(np.unique(rfip), np.unique(sfip))
+
+    site = Site(sgrid, sinit, srst, sfip, sdata, sgeom)
+    regional = replace(shared, rfip=rfip, window=rnear)
+
+    sopn = np.zeros(np.prod(sdim))
+
+    mly, mlx = find_ij_orientation(sgeom)
+
+    if nonregular:
+        actnum = np.array(sinit["PORV"]) > 0
+        grid = np.any(actnum.reshape(sdim[2], sdim[1], sdim[0]), axis=0)
+        boundary, dire = site_contour(grid, np.argwhere(grid)[0].tolist())
+
+        bc = get_bccon(site, boundaries, explicit, np.array(boundary), dire, sopn)
+        sopn = bc.sopn
+        xy = get_xymaps(regional, ufip, zones, bc.coords)
+
+        proj, sbound, spres = contour_operator(rrst, sgrid, xy, bc, explicit, zones)
+        oprn, fipn = xy.oprn, np.array([], dtype=int)
 
     else:
         sb = extract_site_borders(
-            sgrid, sdim, sinit, srst, boundaries, explicit, mly, mlx, sfip
+            sgeom, sdim, sinit, srst, boundaries, explicit, mly, mlx, sfip
         )
 
         spres = sb.spres
@@ -358,10 +403,10 @@ def create_deck(
         )
 
         rc, snum = find_regional_cells(
-            rgrid, sgrid, sinit, rinit, rfip, zones, borders, ract
+            rgrid, rgeom, (rwin, rnear), sgeom, sinit, rinit, rfip, zones, borders, ract
         )
 
-        sbound = rc.sbound
+        sbound, oprn, fipn = rc.sbound, rc.oprn, rc.fipn
 
         data = InterpData(
             rc.ri,
@@ -381,235 +426,274 @@ def create_deck(
             snum,
         )
 
-        nsteps = len(rrst)
-        rp = [[] for _ in range(nsteps)]
+        proj, sbound = projection_operator(
+            rrst, rgrid, sgrid, data, sbound, ufip, explicit, zones, sopn
+        )
 
-        print("Dynamic interpolator:")
-        show_progress = sys.stdout.isatty()
-        if show_progress:
-            bar_ctx = alive_bar(nsteps, bar="fish")
+    return Operators(proj, sbound, np.array(spres, dtype=float), sopn, oprn, fipn)
+
+
+def cache_key(cases: list[str], options: tuple, restarts: list[str]) -> str:
+    """Hash of the EGRID/INIT files of the given cases, the initial pressures in
+    the given restart files (e.g., the site pressures in the cached spres), and
+    the static options"""
+    sha = hashlib.sha256(f"{CACHE_VERSION} {options}".encode())
+    for case in cases:
+        for ext in [".EGRID", ".INIT"]:
+            sha.update(file_digest(case + ext))
+    for path in restarts:
+        sha.update(file_digest(path, "PRESSURE"))
+    return sha.hexdigest()
+
+
+def file_digest(path: str, keyword: str = "") -> bytes:
+    """Hash of a file (or of the keyword array at step 0 of a restart file),
+    reused while its modification time and size do not change"""
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    name = f"{path} {keyword}"
+    if name not in DIGESTS or DIGESTS[name][0] != stamp:
+        sha = hashlib.sha256()
+        if keyword:
+            sha.update(RestartReader(path, mapped=False)[keyword, 0].tobytes())
         else:
-            bar_ctx = nullcontext()
-        with bar_ctx as bar_animation:
-            for i in range(nsteps):
-                if show_progress:
-                    bar_animation()
-                rp_i, sbound = project_pressures(
-                    rrst, rgrid, sgrid, data, sbound, ufip, explicit, zones, sopn, i
-                )
-                rp[i] = rp_i
+            with open(path, "rb") as f:
+                while chunk := f.read(1 << 24):
+                    sha.update(chunk)
+        DIGESTS[name] = (stamp, sha.digest())
+    return DIGESTS[name][1]
+
+
+def save_cache(path: str, key: str, ops: Operators) -> None:
+    """Write the boundary operators to a npz file"""
+    proj = ops.proj
+    np.savez(
+        path,
+        version=CACHE_VERSION,
+        key=key,
+        keys=np.array(proj.keys, dtype=int),
+        pres_data=proj.pres.data,
+        pres_indices=proj.pres.indices,
+        pres_indptr=proj.pres.indptr,
+        pres_shape=proj.pres.shape,
+        pcols=proj.pcols,
+        dens_data=proj.dens.data,
+        dens_indices=proj.dens.indices,
+        dens_indptr=proj.dens.indptr,
+        dens_shape=proj.dens.shape,
+        dcols=proj.dcols,
+        sbound=ops.sbound,
+        spres=ops.spres,
+        sopn=ops.sopn,
+        oprn=ops.oprn,
+        fipn=ops.fipn,
+    )
+
+
+def load_cache(
+    path: str, key: str, rrst: RestartReader, explicit: bool
+) -> Operators | None:
+    """Read the boundary operators if the cache file matches the key"""
+    if not os.path.isfile(path):
+        return None
+    with np.load(path) as cache:
+        if int(cache["version"]) != CACHE_VERSION or str(cache["key"]) != key:
+            return None
+        pres, dens = (
+            csr_matrix(
+                (
+                    cache[f"{name}_data"],
+                    cache[f"{name}_indices"],
+                    cache[f"{name}_indptr"],
+                ),
+                shape=tuple(cache[f"{name}_shape"]),
+            )
+            for name in ["pres", "dens"]
+        )
+        pcols = cache["pcols"]
+        proj = Projection(
+            np.asarray(cache["keys"], dtype=int).tolist(),
+            pres,
+            pcols,
+            dens,
+            cache["dcols"],
+            np.array([]) if explicit else rrst.gather("PRESSURE", 0, pcols),
+        )
+        return Operators(
+            proj,
+            cache["sbound"],
+            cache["spres"],
+            cache["sopn"],
+            cache["oprn"],
+            cache["fipn"],
+        )
+
 
-    sdays, ddays, sbc = temporal_interpolation(
-        freq, acoeff, sdays, isdays, rdays, rp, explicit, spres
+def save_state(
+    path: str,
+    key: str,
+    rrst: RestartReader,
+    proj: Projection,
+    rdays: NDArray,
+    sdays: NDArray,
+) -> None:
+    """Write the regional and site times of the written BCPROP files"""
+    np.savez(
+        path,
+        key=key,
+        rdays=rdays,
+        sdays=sdays,
+        pressure=rrst.gather("PRESSURE", len(rdays) - 1, proj.pcols),
     )
 
-    write_files(fol, fsit, freq, ddays, sdata, sbound, sbc, sdays, sopn)
+
+def written_times(
+    path: str,
+    fol: str,
+    key: str,
+    rrst: RestartReader,
+    proj: Projection,
+    rdays: NDArray,
+    sdays: NDArray,
+) -> int:
+    """Number of leading site report steps with BCPROP files still valid
+
+    This is the case when the regional run has only been extended since the
+    files were written, i.e., same operators, same previous regional steps
+    (checking the pressures at the last one), and same site times before it.
+    """
+    if not os.path.isfile(path) or not sdays.size:
+        return 0
+    with np.load(path) as state:
+        old_rdays, old_sdays = np.array(state["rdays"]), np.array(state["sdays"])
+        nsteps = len(old_rdays)
+        if (
+            str(state["key"]) != key
+            or nsteps > len(rdays)
+            or not np.array_equal(rdays[:nsteps], old_rdays)
+            or not np.array_equal(
+                rrst.gather("PRESSURE", nsteps - 1, proj.pcols), state["pressure"]
+            )
+        ):
+            return 0
+    first = int(np.searchsorted(sdays, old_rdays[-1]))
+    if not np.array_equal(sdays[:first], old_sdays[:first]):
+        return 0
+    if not all(os.path.isfile(f"{fol}/bc/BCPROP{i}.INC") for i in range(first)):
+        return 0
+    return first
+
+
+def write_operator_includes(
+    ops: Operators, freg: str, nonregular: bool, fol: str = ""
+) -> None:
+    """Write the OPERNUM (and FIPNUM) regional include files (in fol/regional)"""
+    if fol:
+        os.makedirs(f"{fol}/regional", exist_ok=True)
+        write_include(f"{fol}/regional/OPERNUM_EXPRECCS.INC", "OPERNUM", ops.oprn)
+        if not nonregular:
+            write_include(f"{fol}/regional/FIPNUM_EXPRECCS.INC", "FIPNUM", ops.fipn)
+    elif nonregular:
+        write_include(f"{freg}/OPERNUM_EXPRECCS.INC", "OPERNUM", ops.oprn)
+    else:
+        write_include("OPERNUM_EXPRECCS.INC", "OPERNUM", ops.oprn)
+        write_include("FIPNUM_EXPRECCS.INC", "FIPNUM", ops.fipn)
+
+
+def write_include(path: str, keyword: str, values: NDArray) -> None:
+    """Write an include file with the values of a keyword in compact format"""
+    with open(path, "w", encoding="utf8") as f:
+        f.write(HEADER)
+        f.write(f"{keyword}\n")
+        f.write("".join(compact_format(values)))
+        f.write("/\n")
 
 
 def get_xymaps(
     regional: Regional,
     ufip: NDArray,
     zones: bool,
-    coords: list[list[float]],
+    coords: NDArray,
 ) -> XYMaps:
-    """Get the coordinates"""
-    rgrid = regional.grid
+    """Get the coordinates
+
+    For each regional cell closest to a boundary face, the cell and its i+1,
+    i-1, j-1, and j+1 neighbours not added before give two interpolation points
+    each, at the top and bottom of the cells, all gathered from index arrays.
+    """
     rinit = regional.init
     rfip = regional.rfip
+    rgeom = regional.geom
 
-    fipr, x_i, y_i, z_i, inds, offset = [], [], [], [], [], []
-    rtmin = np.inf
-    rdim = rgrid.dimension
-    nxyz = np.prod(rdim)
-    oprn = np.zeros(nxyz, dtype=int)
+    oprn = np.zeros(np.prod(rgeom.dims), dtype=int)
     actnum = np.array(rinit["PORV"]) > 0
-    nact = sum(actnum)
-
-    c_x = np.empty(nact, dtype=float)
-    c_y = np.empty(nact, dtype=float)
-    c_z = np.empty(nact, dtype=float)
-    act_inds = np.empty(nact, dtype=int)
-
-    nxyz = np.prod(rdim)
-    x = np.empty(nxyz, dtype=float)
-    y = np.empty(nxyz, dtype=float)
-    z = np.empty(nxyz, dtype=float)
-    n, ind = 0, 0
-    for k in range(rdim[2]):
-        for j in range(rdim[1]):
-            for i in range(rdim[0]):
-                x[ind], y[ind], z[ind] = np.mean(
-                    rgrid.xyz_from_ijk(i, j, k, True), axis=1
-                )
-                if actnum[ind]:
-                    c_x[n] = x[ind]
-                    c_y[n] = y[ind]
-                    c_z[n] = z[ind]
-                    act_inds[n] = ind
-                    n += 1
-                ind += 1
-    act_inds = np.array(act_inds)
-    tree = cKDTree(np.column_stack((c_x, c_y, c_z)))
+    x, y, z = rgeom.centres.T
+    act_inds = regional.window[actnum[regional.window]]
+    tree = cKDTree(rgeom.centres[act_inds])
+    porv_index = np.cumsum(actnum) - 1
+    active = active_indices(rgeom)
     dz = 0.5 * np.array(rinit["DZ"])
-    act = actnum
-    inds_set = set()
-
-    for coord in coords:
-        _, idx = tree.query(coord)
-        ind = act_inds[idx]
-        ijk = rgrid.ijk_from_global_index(ind)
-
-        if not act[ind] or (zones and rfip[idx] not in ufip):
-            continue
 
-        take = [False, False, False, False, False]
-
-        if idx not in inds_set:
-            take[0] = True
-            x_i.append(x[ind])
-            y_i.append(y[ind])
-            z_i.append(z[ind] - dz[idx])
-            offset.append(-dz[idx])
-            inds.append(idx)
-            inds_set.add(idx)
-            fipr.append(rfip[idx])
-            oprn[ind] = 1
-
-        if ijk[0] < rdim[0] - 1:
-            tmp = rgrid.active_index(ijk[0] + 1, ijk[1], ijk[2])
-            if tmp not in inds_set:
-                take[1] = True
-                oprn[ind + 1] = 1
-                x_i.append(x[ind + 1])
-                y_i.append(y[ind + 1])
-                z_i.append(z[ind + 1] - dz[tmp])
-                offset.append(-dz[tmp])
-                inds.append(tmp)
-                inds_set.add(tmp)
-                fipr.append(rfip[tmp])
-
-        if 0 < ijk[0]:
-            tmp = rgrid.active_index(ijk[0] - 1, ijk[1], ijk[2])
-            if tmp not in inds_set:
-                take[2] = True
-                oprn[ind - 1] = 1
-                x_i.append(x[ind - 1])
-                y_i.append(y[ind - 1])
-                z_i.append(z[ind - 1] - dz[tmp])
-                offset.append(-dz[tmp])
-                inds.append(tmp)
-                inds_set.add(tmp)
-                fipr.append(rfip[tmp])
-
-        if 0 < ijk[1]:
-            tmp = rgrid.active_index(ijk[0], ijk[1] - 1, ijk[2])
-            if tmp not in inds_set:
-                take[3] = True
-                oprn[ind - rdim[0]] = 1
-                x_i.append(x[ind - rdim[0]])
-                y_i.append(y[ind - rdim[0]])
-                z_i.append(z[ind - rdim[0]] - dz[tmp])
-                offset.append(-dz[tmp])
-                inds.append(tmp)
-                inds_set.add(tmp)
-                fipr.append(rfip[tmp])
-
-        if ijk[1] < rdim[1] - 1:
-            tmp = rgrid.active_index(ijk[0], ijk[1] + 1, ijk[2])
-            if tmp not in inds_set:
-                take[4] = True
-                oprn[ind + rdim[0]] = 1
-                x_i.append(x[ind + rdim[0]])
-                y_i.append(y[ind + rdim[0]])
-                z_i.append(z[ind + rdim[0]] - dz[tmp])
-                offset.append(-dz[tmp])
-                inds.append(tmp)
-                inds_set.add(tmp)
-                fipr.append(rfip[tmp])
-
-        if take[0]:
-            x_i.append(x[ind])
-            y_i.append(y[ind])
-            z_i.append(z[ind] + dz[idx])
-            offset.append(dz[idx])
-            inds.append(tmp)
-            fipr.append(rfip[idx])
-
-        if take[1]:
-            tmp = rgrid.active_index(ijk[0] + 1, ijk[1], ijk[2])
-            x_i.append(x[ind + 1])
-            y_i.append(y[ind + 1])
-            z_i.append(z[ind + 1] + dz[tmp])
-            offset.append(dz[tmp])
-            inds.append(tmp)
-            fipr.append(rfip[tmp])
-
-        if take[2]:
-            tmp = rgrid.active_index(ijk[0] - 1, ijk[1], ijk[2])
-            x_i.append(x[ind - 1])
-            y_i.append(y[ind - 1])
-            z_i.append(z[ind - 1] + dz[tmp])
-            offset.append(dz[tmp])
-            inds.append(tmp)
-            fipr.append(rfip[tmp])
-
-        if take[3]:
-            x_i.append(x[ind - rdim[0]])
-            y_i.append(y[ind - rdim[0]])
-            z_i.append(z[ind - rdim[0]] + dz[tmp])
-            offset.append(dz[tmp])
-            inds.append(tmp)
-            fipr.append(rfip[tmp])
-
-        if take[4]:
-            tmp = rgrid.active_index(ijk[0], ijk[1] + 1, ijk[2])
-            x_i.append(x[ind + rdim[0]])
-            y_i.append(y[ind + rdim[0]])
-            z_i.append(z[ind + rdim[0]] + dz[tmp])
-            offset.append(dz[tmp])
-            inds.append(tmp)
-            fipr.append(rfip[tmp])
-
-    if zones and z_i:
-        rtmin = np.min(z_i)
+    cells = nearest_cells(
+        tree, coords, act_inds, partial(centres_tree, rgeom, np.flatnonzero(actnum))
+    )
+    if zones:
+        cells = cells[np.isin(rfip[porv_index[cells]], ufip)]
+    idx = porv_index[cells]
+
+    table = neighbour_table(rgeom.dims, cells)[:, [3, 2, 0, 1]]
+    inside = table >= 0
+    glob = np.column_stack((cells, np.where(inside, table, cells[:, None])))
+    acts = np.column_stack((idx, np.where(inside, active[table], -1)))
+    valid = np.column_stack((np.ones(len(cells), dtype=bool), inside)).ravel()
+    taken = np.zeros(valid.size, dtype=bool)
+    _, first = np.unique(acts.ravel()[valid], return_index=True)
+    taken[np.flatnonzero(valid)[first]] = True
+    take = taken.reshape(-1, 5)
+    oprn[glob[take]] = 1
+
+    # the bottom points of the cell and the j-1 neighbour take the index of the
+    # last neighbour evaluated before them
+    last = idx
+    for col in range(4):
+        last = np.where(inside[:, col], acts[:, col + 1], last)
+    jprev = np.where(take[:, 2], acts[:, 2], np.where(take[:, 1], acts[:, 1], last))
+    bottom = np.column_stack((idx, acts[:, 1], acts[:, 2], jprev, acts[:, 4]))
+    binds = bottom.copy()
+    binds[:, 0] = last
+
+    both = np.column_stack((take, take))
+    gcells = np.column_stack((glob, glob))[both]
+    z_i = np.column_stack((z[glob] - dz[acts], z[glob] + dz[bottom]))[both]
 
     return XYMaps(
-        np.array(x_i),
-        np.array(y_i),
-        np.array(z_i),
-        inds,
-        np.array(fipr),
-        offset,
+        x[gcells],
+        y[gcells],
+        z_i,
+        np.column_stack((acts, binds))[both],
+        rfip[np.column_stack((acts, bottom))[both]],
+        np.column_stack((-dz[acts], dz[bottom]))[both],
         oprn,
-        rtmin,
+        np.min(z_i) if zones and z_i.size else np.inf,
     )
 
 
 def get_bccon(
     site: Site,
-    regional: Regional,
     boundaries: list[int],
     explicit: bool,
     boundary: NDArray,
     dire: list[int],
     sopn: NDArray,
 ) -> BCCon:
-    """Handle the boundary"""
-    sgrid = site.grid
-    sinit = site.init
-    srst = site.rst
-    sfip = site.sfip
+    """Handle the boundary
 
-    rgrid = regional.grid
-    rinit = regional.init
-    rfip = regional.rfip
-
-    coords, spres = [], []
-    krfips: list[int] = []
-    ksfips: list[int] = []
-
-    stmin = np.inf
-    sdim = sgrid.dimension
+    The faces of all contour cells and layers are built at once, in the order
+    layer by layer along the contour.
+    """
+    sinit = site.init
+    sdim = site.grid.dimension
+    snxy = sdim[0] * sdim[1]
     act = np.array(sinit["PORV"]) > 0
 
     dx, dy, dz = 1.0 * act, 1.0 * act, 1.0 * act
@@ -617,72 +701,44 @@ def get_bccon(
     dy[act] = sinit["DY"]
     dz[act] = sinit["DZ"]
 
-    sbound = []
-
-    for k in range(sdim[2]):
-        for i, val in enumerate(boundary):
-            ind = int(val[0] * sdim[0] + val[1] + k * sdim[0] * sdim[1])
-            if not act[ind]:
-                continue
-            if dire[i] == 1 and boundaries[2] == -1 and val[0] == sdim[1] - 1:
-                continue
-            if dire[i] == 2 and boundaries[3] == -1 and val[1] == 0:
-                continue
-            if dire[i] == 3 and boundaries[0] == -1 and val[0] == 0:
-                continue
-            if dire[i] == 4 and boundaries[1] == -1 and val[1] == sdim[0] - 1:
-                continue
-
-            sopn[ind] = dire[i]
-            xyz = np.mean(sgrid.xyz_from_ijk(val[1], val[0], k, True), axis=1)
-
-            if k == 0:
-                stmin = min(stmin, xyz[2] - 0.5 * dz[ind])
-
-            if dire[i] == 1:
-                coords.append([xyz[0], xyz[1] + 0.5 * dy[ind], xyz[2]])
-                sbound.append(
-                    f"{i+1} {val[1]+1} {val[1]+1} {val[0]+1} {val[0]+1} {k+1} {k+1} 'J' /"
-                )
-            elif dire[i] == 2:
-                coords.append([xyz[0] - 0.5 * dx[ind], xyz[1], xyz[2]])
-                sbound.append(
-                    f"{i+1} {val[1]+1} {val[1]+1} {val[0]+1} {val[0]+1} {k+1} {k+1} 'I-' /"
-                )
-            elif dire[i] == 3:
-                coords.append([xyz[0], xyz[1] - 0.5 * dy[ind], xyz[2]])
-                sbound.append(
-                    f"{i+1} {val[1]+1} {val[1]+1} {val[0]+1} {val[0]+1} {k+1} {k+1} 'J-' /"
-                )
-            elif dire[i] == 4:
-                coords.append([xyz[0] + 0.5 * dx[ind], xyz[1], xyz[2]])
-                sbound.append(
-                    f"{i+1} {val[1]+1} {val[1]+1} {val[0]+1} {val[0]+1} {k+1} {k+1} 'I' /"
-                )
+    nbound = len(boundary)
+    k = np.repeat(np.arange(sdim[2]), nbound)
+    face = np.tile(np.arange(nbound), sdim[2])
+    j, i, drs = boundary[face, 0], boundary[face, 1], np.asarray(dire)[face]
+    ind = i + j * sdim[0] + k * snxy
+    keep = act[ind]
+    keep &= ~((drs == 1) & (boundaries[2] == -1) & (j == sdim[1] - 1))
+    keep &= ~((drs == 2) & (boundaries[3] == -1) & (i == 0))
+    keep &= ~((drs == 3) & (boundaries[0] == -1) & (j == 0))
+    keep &= ~((drs == 4) & (boundaries[1] == -1) & (i == sdim[0] - 1))
+    k, face, j, i, drs, ind = (
+        k[keep],
+        face[keep],
+        j[keep],
+        i[keep],
+        drs[keep],
+        ind[keep],
+    )
+
+    sopn[ind] = drs
+    coords = site.geom.centres[ind]
+    top = k == 0
+    stmin = np.min(coords[top, 2] - 0.5 * dz[ind[top]]) if np.any(top) else np.inf
+    coords[:, 1] += 0.5 * dy[ind] * ((drs == 1).astype(int) - (drs == 3))
+    coords[:, 0] += 0.5 * dx[ind] * ((drs == 4).astype(int) - (drs == 2))
 
-            if not explicit:
-                inda = sgrid.active_index(val[1], val[0], k)
-                spres.append(srst["PRESSURE", 0][inda])
+    sbound = np.zeros(len(ind), dtype=FACE)
+    sbound["id"], sbound["i"], sbound["j"], sbound["k"] = face + 1, i, j, k
+    sbound["dir"] = np.array(["", "J", "I-", "J-", "I"])[drs]
+    sbound["active"] = True
 
+    spres, ksfips = [], []
     if not explicit:
-        for gridn, initn, fip_arr, kfips in [
-            (rgrid, rinit, rfip, krfips),
-            (sgrid, sinit, sfip, ksfips),
-        ]:
-            dimn = gridn.dimension
-            actn = np.array(initn["PORV"]) > 0
-            for k in range(dimn[2]):
-                for j in range(dimn[1]):
-                    for i in range(dimn[0]):
-                        ind = i + j * dimn[0] + k * dimn[0] * dimn[1]
-                        inda = gridn.active_index(i, j, k)
-                        if actn[ind] and len(kfips) == k:
-                            kfips.append(fip_arr[inda])
-                            break
-                    if len(kfips) == k + 1:
-                        break
-                if len(kfips) == k:
-                    kfips.append(-1)
+        active = np.cumsum(site.geom.actnum > 0) - 1
+        spres = site.rst.gather("PRESSURE", 0, active[ind]).tolist()
+        layers = act.reshape(sdim[2], snxy)
+        first = np.argmax(layers, axis=1) + np.arange(sdim[2]) * snxy
+        ksfips = np.where(np.any(layers, axis=1), site.sfip[active[first]], -1).tolist()
 
     return BCCon(coords, sbound, spres, ksfips, stmin, sopn)
 
@@ -691,95 +747,79 @@ def site_contour(
     grid: NDArray,
     start: list[int],
 ) -> tuple[list[list[int]], list[int]]:
-    """Process the site contour"""
-    directions = [(-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1)]
+    """Process the site contour
+
+    Moore-neighbour tracing from the start cell. The occupancy of the eight
+    neighbours of all cells and the next direction for each occupancy and
+    backtrack direction are tabulated with array operations first, then the
+    walk only does table lookups.
+    """
+    grid = np.asarray(grid, dtype=bool)
+    nrows, ncols = grid.shape
+    padded = np.pad(grid, 1)
+    bits = np.zeros(grid.shape, dtype=int)
+    for n, (dr, dc) in enumerate(MOORE):
+        bits |= padded[1 + dr : 1 + dr + nrows, 1 + dc : 1 + dc + ncols] << n
+    order = (np.arange(8)[:, None] + 1 + np.arange(8)) % 8
+    occupied = (np.arange(256)[:, None, None] >> order) & 1
+    table = np.where(
+        np.any(occupied, axis=2),
+        order[np.arange(8), np.argmax(occupied, axis=2)],
+        -1,
+    ).tolist()
+    bits_l, grid_l = bits.tolist(), grid.tolist()
+    side = [1, 2, 2, 3, 3, 4, 4, 1]
+
     boundary, dire = [], []
-    current = start
-    backtrack_dir = 7
-    start_backtrack = backtrack_dir
+    current = list(start)
+    backtrack = 7
     first = True
-    nrows, ncols = len(grid), len(grid[0])
     while True:
         boundary.append(current)
-        found = False
-        for i in range(8):
-            dir_idx = (backtrack_dir + 1 + i) % 8
-            dr, dc = directions[dir_idx]
-            nr, nc = current[0] + dr, current[1] + dc
-            if 0 <= nr < nrows and 0 <= nc < ncols and grid[nr][nc]:
-                if len(boundary) == 1:
-                    if current[0] == 0 or not grid[current[0] - 1][current[1]]:
-                        dire.append(2)
-                    elif (
-                        current[0] == nrows - 1 or not grid[current[0] + 1][current[1]]
-                    ):
-                        dire.append(4)
-                    elif current[1] == 0 or not grid[current[0]][current[1] - 1]:
-                        dire.append(3)
-                    elif (
-                        current[1] == ncols - 1 or not grid[current[0]][current[1] + 1]
-                    ):
-                        dire.append(1)
-                current = [nr, nc]
-                backtrack_dir = (dir_idx + 6) % 8
-                if dir_idx in [0, 7]:
-                    dire.append(1)
-                elif dir_idx in [1, 2]:
-                    dire.append(2)
-                elif dir_idx in [3, 4]:
-                    dire.append(3)
-                else:
-                    dire.append(4)
-                found = True
-                break
-        if not found:
+        dir_idx = table[bits_l[current[0]][current[1]]][backtrack]
+        if dir_idx < 0:
             break
-        if current == start and backtrack_dir == start_backtrack and not first:
+        if len(boundary) == 1:
+            row, col = current
+            if row == 0 or not grid_l[row - 1][col]:
+                dire.append(2)
+            elif row == nrows - 1 or not grid_l[row + 1][col]:
+                dire.append(4)
+            elif col == 0 or not grid_l[row][col - 1]:
+                dire.append(3)
+            elif col == ncols - 1 or not grid_l[row][col + 1]:
+                dire.append(1)
+        dr, dc = MOORE[dir_idx]
+        current = [current[0] + dr, current[1] + dc]
+        backtrack = (dir_idx + 6) % 8
+        dire.append(side[dir_idx])
+        if current == list(start) and backtrack == 7 and not first:
             break
         first = False
     return boundary, dire
 
 
-def compact_format_numeric(v: NDArray) -> list[str]:
-    "To 'n*x' notation"
-    change_idx = np.flatnonzero(np.diff(v, prepend=v[0] - 1))
-    counts = np.diff(np.append(change_idx, v.size))
-    vals = v[change_idx]
-
-    out = []
-    for val, n in zip(vals, counts):
-        val_str = str(int(val)) if float(val).is_integer() else str(val)
-        out.append(f"{n}*{val_str} " if n > 1 else f"{val_str} ")
-    return out
-
-
 def handle_grid_coord(
-    sgrid: OpmGrid,
-    rgrid: OpmGrid,
+    sgeom: Geometry,
+    rgeom: Geometry,
+    rwin: NDArray,
     sinit: OpmFile,
     rinit: OpmFile,
-) -> tuple[NDArray, NDArray, NDArray, NDArray, NDArray, int, int, list[list[float]]]:
+) -> tuple[NDArray, NDArray, NDArray, list[list[float]]]:
     """Handle the grid coordinates"""
-    sdim = sgrid.dimension
-    rdim = rgrid.dimension
-    x0y0 = sgrid.xyz_from_ijk(0, 0, 0, True)
-    xny0 = sgrid.xyz_from_ijk(sdim[0] - 1, 0, 0, True)
-    xnyn = sgrid.xyz_from_ijk(sdim[0] - 1, sdim[1] - 1, 0, True)
-    x0yn = sgrid.xyz_from_ijk(0, sdim[1] - 1, 0, True)
+    sdim = sgeom.dims
+    rdim = rgeom.dims
+    snxy = sdim[0] * sdim[1]
+    x0y0, xny0, xnyn, x0yn = cell_corners(
+        sgeom, np.array([0, sdim[0] - 1, snxy - 1, snxy - sdim[0]])
+    )
     sbox = [
         [x0y0[0][0], x0y0[1][0]],
         [xny0[0][1], xny0[1][1]],
-        [xnyn[0][3], xnyn[0][3]],
+        [xnyn[0][3], xnyn[1][3]],
         [x0yn[0][2], x0yn[1][2]],
     ]
     sbox += [sbox[0]]
-    nact = np.sum(sinit["PORV"][: sdim[0] * sdim[1]] > 0)
-    s_x = np.empty(nact, dtype=float)
-    s_y = np.empty(nact, dtype=float)
-    act_inds = np.empty(nact, dtype=int)
-    c_x = np.empty(rgrid.active_cells, dtype=float)
-    c_y = np.empty(rgrid.active_cells, dtype=float)
-    c_z = np.empty(rgrid.active_cells, dtype=float)
     poly = Polygon(
         [
             (sbox[0][0], sbox[0][1]),
@@ -788,117 +828,89 @@ def handle_grid_coord(
             (sbox[3][0], sbox[3][1]),
         ]
     )
-    idx_counter = 0
-    for j in range(sdim[1]):
-        for i in range(sdim[0]):
-            if sgrid.active_index(i, j, 0) > -1:
-                xyz = np.mean(sgrid.xyz_from_ijk(i, j, 0, True), axis=1)
-                s_x[idx_counter] = xyz[0]
-                s_y[idx_counter] = xyz[1]
-                act_inds[idx_counter] = idx_counter
-                idx_counter += 1
-    tree = cKDTree(np.column_stack((s_x, s_y)))
+    stop = np.flatnonzero(sgeom.actnum[:snxy])
+    tree = cKDTree(sgeom.centres[stop, :2])
     dsz = 0.5 * sinit["DZ"]
     drz = 0.5 * rinit["DZ"]
     nxyz = np.prod(rdim)
     fipn = np.ones(nxyz, dtype=int)
     oprn = np.zeros(nxyz, dtype=int)
-    n, g = 0, 0
-    for k in range(rdim[2]):
-        for j in range(rdim[1]):
-            for i in range(rdim[0]):
-                if rgrid.active_index(i, j, k) > -1:
-                    xyz = np.mean(rgrid.xyz_from_ijk(i, j, k, True), axis=1)
-                    c_x[g] = xyz[0]
-                    c_y[g] = xyz[1]
-                    c_z[g] = xyz[2]
-                    point = Point(xyz[0], xyz[1])
-                    if poly.contains(point):
-                        _, idx = tree.query([xyz[0], xyz[1]])
-                        ind = int(act_inds[idx])
-                        ijk = sgrid.ijk_from_active_index(ind)
-                        z_t = np.mean(
-                            sgrid.xyz_from_ijk(ijk[0], ijk[1], ijk[2], True), axis=1
-                        )[2]
-                        z_b = np.mean(
-                            sgrid.xyz_from_ijk(
-                                ijk[0], ijk[1], ijk[2] + sdim[2] - 1, True
-                            ),
-                            axis=1,
-                        )[2]
-                        fipn[n] = k + 2
-                        d_z = drz[rgrid.active_index(i, j, k)]
-                        if (
-                            c_z[-1] + d_z >= z_t - dsz[ind]
-                            and c_z[-1] - d_z <= z_b + dsz[ind]
-                        ):
-                            oprn[n] = 1
-                        else:
-                            oprn[n] = 7
-                    g += 1
-                n += 1
+    ract = rwin[rgeom.actnum[rwin] > 0]
+    c_x, c_y, c_z = rgeom.centres[ract].T
+    inside = np.flatnonzero(contains_xy(poly, c_x, c_y))
+    _, idx = tree.query(np.column_stack((c_x[inside], c_y[inside])), workers=-1)
+    z_t = sgeom.centres[stop[idx], 2]
+    z_b = sgeom.centres[stop[idx] + snxy * (sdim[2] - 1), 2]
     rnxy = rdim[0] * rdim[1]
-    rnxyz = rnxy * rdim[2]
-    return fipn, oprn, c_x, c_y, c_z, rnxy, rnxyz, sbox
+    n = ract[inside]
+    fipn[n] = n // rnxy + 2
+    d_z = drz[np.cumsum(rgeom.actnum)[n] - 1]
+    oprn[n] = np.where(
+        (c_z[inside] + d_z >= z_t - dsz[idx]) & (c_z[inside] - d_z <= z_b + dsz[idx]),
+        1,
+        7,
+    )
+    return fipn, oprn, ract, sbox
 
 
 def check_regional_neighbours(
-    rgrid: OpmGrid,
+    rgeom: Geometry,
     ract: NDArray,
     rfip: NDArray,
-    rnxy: int,
-    ri: list[int],
-    rx: list[float],
-    ry: list[float],
-    rz: list[float],
-    rk: list[int],
-    rf: list[int],
-    rt: list[float],
-    gind: int,
+    cells: NDArray,
     n: int,
     d_z: NDArray,
     oprn: NDArray,
-) -> NDArray:
-    """Check the regional neighbours"""
-    rdim = rgrid.dimension
-    ijk = rgrid.ijk_from_global_index(gind)
-    noise = -1e-4 * np.random.rand() if rdim[2] > 1 else 0
-
-    def add_neigh(gtmp, ijk_n, kval):
-        if gtmp < 0 or gtmp >= rnxy * rdim[2] or not ract[gtmp]:
-            return
-        tmp = rgrid.active_index(ijk_n[0], ijk_n[1], ijk_n[2])
-        if tmp in ri:
-            return
-        xyz = np.mean(rgrid.xyz_from_ijk(ijk_n[0], ijk_n[1], ijk_n[2], True), axis=1)
-        rx.append(xyz[0])
-        ry.append(xyz[1])
-        rz.append(noise + xyz[2])
-        ri.append(tmp)
-        rk.append(kval)
-        rf.append(rfip[tmp])
-        rt.append(xyz[2] - d_z[tmp])
-        oprn[gtmp] = 2 + n if int(oprn[gtmp]) == 2 + n else 6
-
-    if ijk[1] - 1 >= 0:
-        add_neigh(gind - rdim[0], (ijk[0], ijk[1] - 1, ijk[2]), ijk[2])
-    if ijk[1] + 1 < rdim[1]:
-        add_neigh(gind + rdim[0], (ijk[0], ijk[1] + 1, ijk[2]), ijk[2])
-    if ijk[0] - 1 >= 0:
-        add_neigh(gind - 1, (ijk[0] - 1, ijk[1], ijk[2]), ijk[2])
-    if ijk[0] + 1 < rdim[0]:
-        add_neigh(gind + 1, (ijk[0] + 1, ijk[1], ijk[2]), ijk[2])
-    if gind - rnxy >= 0:
-        add_neigh(gind - rnxy, (ijk[0], ijk[1], ijk[2] - 1), ijk[2] - 1)
-    if gind + rnxy < rnxy * rdim[2]:
-        add_neigh(gind + rnxy, (ijk[0], ijk[1], ijk[2] + 1), ijk[2] + 1)
-
-    return oprn
+) -> tuple[NDArray, ...]:
+    """Stencil points of the regional cells crossing a site side
+
+    Each cell is followed by its active j-1, j+1, i-1, i+1, k-1, and k+1
+    neighbours not added before for this side. The cells are labeled 2 + n in
+    OPERNUM, and the neighbours too if they had this label, else 6.
+
+    Returns:
+        tuple: Active indices, x, y, z, layer, fipnum, and top of the points
+
+    """
+    nz = rgeom.dims[2]
+    nxy = rgeom.dims[0] * rgeom.dims[1]
+    active = active_indices(rgeom)
+    noise = -cell_jitter(cells, 1e-4) if nz > 1 else np.zeros(len(cells))
+    cand = np.column_stack((cells, neighbour_table(rgeom.dims, cells)))
+    valid = cand >= 0
+    valid[:, 1:] &= ract[cand[:, 1:]]
+    acts = active[cand].ravel()
+    flat = np.flatnonzero(valid.ravel())
+    kept = np.zeros(cand.size, dtype=bool)
+    _, first = np.unique(acts[flat], return_index=True)
+    kept[flat[first]] = True
+    keep = kept.reshape(cand.shape)
+    keep[:, 0] = True
+
+    neigh = cand[:, 1:][keep[:, 1:]]
+    oprn[neigh] = np.where(oprn[neigh] == 2 + n, 2 + n, 6)
+    oprn[cells] = 2 + n
+
+    points, inds = cand[keep], acts[keep.ravel()]
+    xyz = rgeom.centres[points]
+    lift = np.column_stack((np.zeros(len(cells)), np.repeat(noise[:, None], 6, 1)))
+    layer = cells[:, None] // nxy + np.array([0, 0, 0, 0, 0, -1, 1])
+    return (
+        inds,
+        xyz[:, 0],
+        xyz[:, 1],
+        xyz[:, 2] + lift[keep],
+        layer[keep],
+        rfip[inds],
+        xyz[:, 2] - d_z[inds],
+    )
 
 
 def find_regional_cells(
     rgrid: OpmGrid,
-    sgrid: OpmGrid,
+    rgeom: Geometry,
+    windows: tuple[NDArray, NDArray],
+    sgeom: Geometry,
     sinit: OpmFile,
     rinit: OpmFile,
     rfip: NDArray,
@@ -906,18 +918,31 @@ def find_regional_cells(
     borders: Borders,
     ract: NDArray,
 ) -> tuple[RegionalCells, list[int]]:
-    """Find the regional cells"""
+    """Find the regional cells
+
+    The closest regional cells to the faces of each side are searched in the
+    window extended by one column (windows[1]), and the faces with equidistant
+    cells in all the active cells, so the cells do not depend on the window size.
+    """
     sx, sy, sz, sf = borders.sx, borders.sy, borders.sz, borders.sf
     sbound = borders.sbound
     sai = borders.sai
     snum = []
     sdel = []
 
-    fipn, oprn, c_x, c_y, c_z, rnxy, rnxyz, sbox = handle_grid_coord(
-        sgrid, rgrid, sinit, rinit
-    )
-    coords_all = np.stack((c_x, c_y, c_z), axis=1)
+    fipn, oprn, _, sbox = handle_grid_coord(sgeom, rgeom, windows[0], sinit, rinit)
+    cells = windows[1][rgeom.actnum[windows[1]] > 0]
+    coords_all = rgeom.centres[cells]
     tree = cKDTree(coords_all)
+    active = np.cumsum(rgeom.actnum)[cells] - 1
+    trees: dict[int, tuple[cKDTree, NDArray] | None] = {}
+    pool = np.flatnonzero(rgeom.actnum)
+    full: dict[int, tuple[cKDTree, NDArray]] = {}
+
+    def full_tree(fin: int = 0) -> tuple[cKDTree, NDArray]:
+        if fin not in full:
+            full[fin] = centres_tree(rgeom, pool[rfip == fin] if zones else pool)
+        return full[fin]
 
     ntot = 0
     for d in range(4):
@@ -925,17 +950,12 @@ def find_regional_cells(
 
     print("\nFind the regional cells to build the interpolator:")
 
-    ri: list[list[int]] = [[], [], [], []]
-    rx: list[list[float]] = [[], [], [], []]
-    ry: list[list[float]] = [[], [], [], []]
-    rz: list[list[float]] = [[], [], [], []]
-    rf: list[list[int]] = [[], [], [], []]
-    rt: list[list[float]] = [[], [], [], []]
-    rk: list[list[int]] = [[], [], [], []]
+    stencil: list[tuple[NDArray, ...]] = []
     rkg: list[list[tuple[float, int]]] = [[], [], [], []]
 
-    count = -1
+    count = 0
     d_z = 0.5 * rinit["DZ"]
+    rdim = rgrid.dimension
 
     show_progress = sys.stdout.isatty()
     if show_progress:
@@ -945,167 +965,108 @@ def find_regional_cells(
 
     with bar_ctx as bar_animation:
         for d in range(4):
-            sx_d, sy_d, sz_d, sf_d = sx[d], sy[d], sz[d], sf[d]
-            ri_d, rx_d, ry_d, rz_d = ri[d], rx[d], ry[d], rz[d]
-            rf_d, rt_d, rk_d = rf[d], rt[d], rk[d]
-
-            fin = None
-            tree_local: cKDTree = cKDTree(np.zeros((1, 3)))  # arbitrary initialization
-            index_map: NDArray = np.array([], dtype=int)
-
-            for i, (x_c, y_c, z_c) in enumerate(zip(sx_d, sy_d, sz_d)):
-                if show_progress:
-                    bar_animation()
-
-                if zones:
-                    if fin != sf_d[i]:
-                        fin = sf_d[i]
-                        mask = rfip == fin
-                        if not np.any(mask):
-                            count += 1
-                            sdel.append(count)
-                            continue
-                        coords_local = coords_all[mask]
-                        index_map = np.where(mask)[0]
-                        tree_local = cKDTree(coords_local)
-
-                    _, idx_local = tree_local.query([x_c, y_c, z_c])
-                    ind = int(index_map[int(idx_local)])
-                else:
-                    _, ind = tree.query([x_c, y_c, z_c])
-                    ind = int(ind)
-
-                count += 1
-                ijk = rgrid.ijk_from_active_index(ind)
-                gind = rgrid.global_index(ijk[0], ijk[1], ijk[2])
-
-                sdim = rgrid.dimension
-                if i > [sdim[0], sdim[1], sdim[0], sdim[0]][d]:
-                    lift = -1e-4
-                else:
-                    lift = 1e-4
-                xyz = np.mean(rgrid.xyz_from_active_index(ind, True), axis=1)
-                rkg[d].append((xyz[2] + lift, ind))
-                lines = []
-                for shift in [rgrid.dimension[0], 1]:
-                    x_l, y_l, x_p, y_p = 0, 0, 0, 0
-                    l_p = [0, 0]
-                    x_m = xyz[0]
-                    y_m = xyz[1]
-                    if gind - shift >= 0 and ract[gind - shift]:
-                        ijk = rgrid.ijk_from_global_index(gind - shift)
-                        xyz_l = np.mean(
-                            rgrid.xyz_from_ijk(ijk[0], ijk[1], ijk[2], True), axis=1
+            points = np.column_stack((sx[d], sy[d], sz[d]))
+            if zones:
+                nglob = np.full(len(points), -1)
+                fips = np.array(sf[d])
+                for fin in np.unique(fips):
+                    if fin not in trees:
+                        mask = rfip[active] == fin
+                        trees[fin] = (
+                            (cKDTree(coords_all[mask]), np.flatnonzero(mask))
+                            if np.any(mask)
+                            else None
                         )
-                        x_l = xyz_l[0]
-                        y_l = xyz_l[1]
-                        l_p[0] = 1
-                    if gind + shift < rnxyz and ract[gind + shift]:
-                        ijk = rgrid.ijk_from_global_index(gind + shift)
-                        xyz_p = np.mean(
-                            rgrid.xyz_from_ijk(ijk[0], ijk[1], ijk[2], True), axis=1
+                    entry = trees[fin]
+                    if entry is not None:
+                        sel = fips == fin
+                        nglob[sel] = nearest_cells(
+                            entry[0],
+                            points[sel],
+                            cells[entry[1]],
+                            partial(full_tree, fin),
                         )
-                        x_p = xyz_p[0]
-                        y_p = xyz_p[1]
-                        l_p[1] = 1
-                    if l_p[0] and l_p[1]:
-                        lines.append(LineString([(x_l, y_l), (x_p, y_p)]))
-                    elif l_p[1]:
-                        lines.append(LineString([(x_m, y_m), (x_p, y_p)]))
-                    elif l_p[0]:
-                        lines.append(LineString([(x_l, y_l), (x_m, y_m)]))
-                    else:
-                        lines.append(0)
-
-                if lines[0] == 0 and lines[1] == 0:
-                    sdel.append(count)
-                    continue
-
-                border = LineString(
-                    [(sbox[d][0], sbox[d][1]), (sbox[d + 1][0], sbox[d + 1][1])]
+            else:
+                nglob = nearest_cells(tree, points, cells, full_tree)
+            nearest = np.where(nglob > -1, np.cumsum(rgeom.actnum)[nglob] - 1, -1)
+            crosses = border_crossings(
+                rgeom, ract, np.maximum(nglob, 0), sbox[d], sbox[d + 1]
+            )
+
+            found = np.flatnonzero(nearest > -1)
+            lift = np.where(found > [rdim[0], rdim[1], rdim[0], rdim[0]][d], -1, 1)
+            rkg[d] = list(
+                zip(
+                    (rgeom.centres[nglob[found], 2] + 1e-4 * lift).tolist(),
+                    nearest[found].tolist(),
                 )
-
-                if lines[0] == 0:
-                    lines[0] = lines[1]
-                elif lines[1] == 0:
-                    lines[1] = lines[0]
-
-                if lines[0].intersects(border) or lines[1].intersects(border):
-                    ijk = rgrid.ijk_from_global_index(gind)
-                    xyz = np.mean(rgrid.xyz_from_active_index(ind, True), axis=1)
-
-                    snum.append(sai[count])
-                    rx_d.append(xyz[0])
-                    ry_d.append(xyz[1])
-                    rz_d.append(xyz[2])
-                    ri_d.append(ind)
-                    rf_d.append(rfip[ind])
-                    rt_d.append(rz_d[-1] - d_z[int(ind)])
-                    rk_d.append(ijk[2])
-
-                    oprn[gind] = d + 2
-                    oprn = check_regional_neighbours(
-                        rgrid,
-                        ract,
-                        rfip,
-                        rnxy,
-                        ri_d,
-                        rx_d,
-                        ry_d,
-                        rz_d,
-                        rk_d,
-                        rf_d,
-                        rt_d,
-                        gind,
-                        d,
-                        d_z,
-                        oprn,
-                    )
-                else:
-                    sdel.append(count)
-
-    for rem in reversed(sdel):
-        del sbound[rem]
-
-    with open("OPERNUM_EXPRECCS.INC", "w", encoding="utf8") as f:
-        f.write(HEADER)
-        f.write("OPERNUM\n")
-        f.write("".join(compact_format_numeric(oprn)))
-        f.write("/\n")
-
-    with open("FIPNUM_EXPRECCS.INC", "w", encoding="utf8") as f:
-        f.write(HEADER)
-        f.write("FIPNUM\n")
-        f.write("".join(compact_format_numeric(fipn)))
-        f.write("/\n")
-
+            )
+            cross = (nearest > -1) & crosses
+            snum += np.array(sai)[count + np.flatnonzero(cross)].tolist()
+            sdel += (count + np.flatnonzero(~cross)).tolist()
+            count += len(nearest)
+            stencil.append(
+                check_regional_neighbours(rgeom, ract, rfip, nglob[cross], d, d_z, oprn)
+            )
+            if show_progress:
+                bar_animation(len(nearest))
+
+    sbound["active"][sdel] = False
+
+    ri, rx, ry, rz, rk, rf, rt = (list(v) for v in zip(*stencil))
     return (
         RegionalCells(
-            [np.array(v) for v in ri],
-            [np.array(v) for v in rx],
-            [np.array(v) for v in ry],
-            [np.array(v) for v in rz],
-            [np.array(v) for v in rf],
-            [np.array(v) for v in rt],
-            [np.array(v) for v in rk],
+            ri,
+            rx,
+            ry,
+            rz,
+            rf,
+            rt,
+            rk,
             rkg,
             sbound,
+            oprn,
+            fipn,
         ),
         snum,
     )
 
 
+def border_crossings(
+    rgeom: Geometry,
+    ract: NDArray,
+    cells: NDArray,
+    start: list[float],
+    end: list[float],
+) -> NDArray:
+    """Check if the lines through the neighbours of the cells cross a site border
+
+    For each cell, the lines join the centres of the previous and next active
+    neighbours along j and along i (or the cell centre if one of them is not
+    active). A cell without active neighbours does not cross the border.
+    """
+    nxyz = ract.size
+    crosses = np.zeros(cells.size, dtype=bool)
+    for shift in [rgeom.dims[0], 1]:
+        prev, post = cells - shift, cells + shift
+        has_prev = (prev >= 0) & ract[np.clip(prev, 0, nxyz - 1)]
+        has_post = (post < nxyz) & ract[np.clip(post, 0, nxyz - 1)]
+        p_0 = window_centres(rgeom, np.where(has_prev, prev, cells))[:, :2]
+        p_1 = window_centres(rgeom, np.where(has_post, post, cells))[:, :2]
+        crosses |= (has_prev | has_post) & segments_intersect(
+            p_0, p_1, np.array(start[:2]), np.array(end[:2])
+        )
+    return crosses
+
+
 def temporal_interpolation(
     freq: NDArray,
     acoeff: NDArray,
     sdays: NDArray,
     isdays: NDArray,
     rdays: NDArray,
-    rp: list[list[tuple[int, float]]],
-    explicit: bool,
-    spres: list[float],
-) -> tuple[NDArray, NDArray, list[str]]:
-    """Temporal interpolator"""
+) -> tuple[NDArray, NDArray]:
+    """Site report steps to write the bc (telescopic partition of the steps)"""
     if np.max(freq) > 0:
         ddays = sdays[1:] - sdays[:-1]
         idays = []
@@ -1133,36 +1094,160 @@ def temporal_interpolation(
     print(isdays)
     print(f"Report steps site to write bc (days, tot={len(sdays)}):")
     print([float(f"{val:.2f}") for val in sdays])
-    nsteps = len(sdays)
-    sbc = ["" for _ in range(nsteps)]
-    nrp = len(rp[0])
-    for i in range(nrp):
-        values = [rp[j][i][1] for j in range(len(rdays))]
-        interp_func = interp1d(rdays, values, fill_value="extrapolate")
-        index_val = rp[0][i][0]
-        for j, time in enumerate(sdays):
-            val = interp_func(time)
-            if explicit:
-                sbc[j] += f"{index_val} DIRICHLET WATER 1* {val} /\n"
-            else:
-                pres = val + spres[index_val - 1]
-                sbc[j] += f"{index_val} DIRICHLET WATER 1* {pres} /\n"
-    return sdays, ddays, sbc
+    return np.array(sdays, dtype=float), ddays
 
 
-def project_pressures(
-    rrst: OpmRestart,
+def write_bcprop(
+    fol: str,
+    rrst: RestartReader,
+    proj: Projection,
+    explicit: bool,
+    rdays: NDArray,
+    sdays: NDArray,
+    spres: NDArray,
+    window: int = 64,
+    jobs: int = 1,
+    first: int = 0,
+) -> None:
+    """Stream the BCPROP files, window site report steps at a time
+
+    Only the regional steps bracketing the site times of a window are projected
+    and interpolated, and the files of the window are written in a background
+    thread while the next window is computed. With jobs > 1, the windows are
+    projected and written by a pool of processes instead. The files of the
+    site times before first are kept.
+    """
+    offset = 0.0
+    if not explicit and proj.keys:
+        offset = spres[np.array(proj.keys) - 1]
+    print("Dynamic interpolator:")
+    show_progress = sys.stdout.isatty()
+    if show_progress:
+        bar_ctx = alive_bar(len(sdays) - first, bar="fish")
+    else:
+        bar_ctx = nullcontext()
+    if jobs > 1:
+        window = max(min(window, -(-(len(sdays) - first) // jobs)), 1)
+        starts = range(first, len(sdays), window)
+        with (
+            bar_ctx as bar_animation,
+            ProcessPoolExecutor(
+                max_workers=jobs,
+                initializer=init_worker,
+                initargs=(fol, rrst.path, proj, explicit, rdays, offset),
+            ) as pool,
+        ):
+            for ntimes in pool.map(
+                bcprop_window, starts, [sdays[i : i + window] for i in starts]
+            ):
+                if show_progress:
+                    bar_animation(ntimes)
+        return
+    with bar_ctx as bar_animation, ThreadPoolExecutor(max_workers=1) as writer:
+        pending = None
+        for start in range(first, len(sdays), window):
+            times = sdays[start : start + window]
+            values = window_values(rrst, proj, explicit, rdays, times, offset)
+            if pending:
+                pending.result()
+            pending = writer.submit(
+                write_bcprop_files, fol, start, times, proj.keys, values
+            )
+            if show_progress:
+                bar_animation(len(times))
+        if pending:
+            pending.result()
+
+
+def window_values(
+    rrst: RestartReader,
+    proj: Projection,
+    explicit: bool,
+    rdays: NDArray,
+    times: NDArray,
+    offset: NDArray | float,
+) -> NDArray:
+    """Boundary pressures at the site times (times x faces)"""
+    weights = time_weights(rdays, times)
+    used = np.flatnonzero(weights.getnnz(axis=0))
+    steps = range(used[0], used[-1] + 1)
+    rp = project_pressures(rrst, proj, explicit, steps)
+    return weights[:, steps.start : steps.stop] @ rp + offset
+
+
+def init_worker(
+    fol: str,
+    path: str,
+    proj: Projection,
+    explicit: bool,
+    rdays: NDArray,
+    offset: NDArray | float,
+) -> None:
+    """Receive the operators once per process and map the regional restart"""
+    WORKER["fol"], WORKER["rrst"], WORKER["proj"] = fol, RestartReader(path), proj
+    WORKER["explicit"], WORKER["rdays"], WORKER["offset"] = explicit, rdays, offset
+
+
+def bcprop_window(start: int, times: NDArray) -> int:
+    """Project and write the BCPROP files of a window in a worker process"""
+    values = window_values(
+        WORKER["rrst"],
+        WORKER["proj"],
+        WORKER["explicit"],
+        WORKER["rdays"],
+        times,
+        WORKER["offset"],
+    )
+    write_bcprop_files(WORKER["fol"], start, times, WORKER["proj"].keys, values)
+    return len(times)
+
+
+def write_bcprop_files(
+    fol: str, start: int, times: NDArray, keys: list[int], values: NDArray
+) -> None:
+    """Write the BCPROP files of consecutive site report steps"""
+    for i, days in enumerate(times):
+        with open(f"{fol}/bc/BCPROP{start + i}.INC", "w", encoding="utf8") as f:
+            f.write(HEADER)
+            f.write(f"-- No. days = {days:.2f}\n")
+            f.write("BCPROP\n")
+            f.write(bcprop_lines(keys, values[i]))
+            f.write("/\n")
+
+
+def time_weights(rdays: NDArray, times: NDArray) -> csr_matrix:
+    """Sparse (times x rdays) matrix of the linear interpolation weights"""
+    lo = np.clip(np.searchsorted(rdays, times, side="right") - 1, 0, len(rdays) - 2)
+    frac = (times - rdays[lo]) / (rdays[lo + 1] - rdays[lo])
+    rows = np.repeat(np.arange(len(times)), 2)
+    cols = np.column_stack((lo, lo + 1)).ravel()
+    vals = np.column_stack((1.0 - frac, frac)).ravel()
+    return csr_matrix((vals, (rows, cols)), shape=(len(times), len(rdays)))
+
+
+def bcprop_lines(keys: list[int], values: NDArray) -> str:
+    """BCPROP entries for the faces with the given keys and pressure values"""
+    prefix = np.char.add(np.array(keys).astype(str), " DIRICHLET WATER 1* ")
+    return "".join(np.char.add(np.char.add(prefix, values.astype(str)), " /\n"))
+
+
+def projection_operator(
+    rrst: RestartReader,
     rgrid: OpmGrid,
     sgrid: OpmGrid,
     data: InterpData,
-    sbound: list[str],
+    sbound: NDArray,
     ufip: NDArray,
     explicit: bool,
     zones: bool,
     sopn: NDArray,
-    i: int,
-) -> tuple[list[tuple[int, float]], list[str]]:
-    """Project the pressures"""
+) -> tuple[Projection, NDArray]:
+    """Precompute the interpolation weights from the regional cells to the site faces
+
+    The regional cell centres and the site face centres do not change in time, then
+    the triangulations are built once and the barycentric weights for each site face
+    are stored in a sparse face-by-regional-cell matrix.
+    """
     ri, rx, ry, rz = data.ri, data.rx, data.ry, data.rz
     sx, sy, sz = data.sx, data.sy, data.sz
     rf, rk, rt, rkg = data.rf, data.rk, data.rt, data.rkg
@@ -1171,36 +1256,46 @@ def project_pressures(
 
     count, c_c, s_s, d_t, whr = 0, 1, 0, 0, 0
     snum_set = set(snum)
-    pressure0 = np.array(rrst["PRESSURE", 0])
-    rp_out: list[tuple[int, float]] = []
-
-    def update_boundary(key, z_b):
-        nonlocal sbound, c_c, s_s
-        if not np.isnan(z_b):
-            rp_out.append((key, z_b))
-            for j, row in enumerate(sbound):
-                edit = row.split()
-                if int(edit[0]) == key:
-                    if i == 0:
-                        edit[0] = str(key if rgrid.dimension[2] > 1 else c_c + s_s)
-                        sbound[j] = " ".join(edit)
-                        sopn[
-                            sgrid.global_index(
-                                int(edit[1]) - 1, int(edit[3]) - 1, int(edit[5]) - 1
-                            )
-                        ] = 2
-                    c_c += 1
-                    break
-        else:
-            if i == 0:
-                sbound = [row for row in sbound if int(row.split()[0]) != key]
-                s_s += 1
+    keys: list[int] = []
+    rows: list[NDArray] = []
+    cols: list[NDArray] = []
+    vals: list[NDArray] = []
+    drows: list[int] = []
+    dcols: list[int] = []
+    dvals: list[float] = []
+    tri, tcols = None, np.array([], dtype=int)
+    pverts, pweights, gverts, gweights = tcols, tcols, tcols, tcols
+    row_of = np.full(np.max(sbound["id"], initial=0) + 1, -1)
+    row_of[sbound["id"]] = np.arange(len(sbound))
+
+    def update_boundary(key, verts, weights):
+        nonlocal c_c, s_s
+        row = row_of[key]
+        if not np.isnan(weights[0]):
+            rows.append(np.full(len(weights), len(keys)))
+            cols.append(verts)
+            vals.append(weights)
+            keys.append(key)
+            if sbound["active"][row]:
+                sbound["id"][row] = key if rgrid.dimension[2] > 1 else c_c + s_s
+                sopn[
+                    sgrid.global_index(
+                        int(sbound["i"][row]),
+                        int(sbound["j"][row]),
+                        int(sbound["k"][row]),
+                    )
+                ] = 2
+                c_c += 1
+            return True
+        sbound["active"][row] = False
+        s_s += 1
+        return False
 
     for d in range(4):
         ri_d, rx_d, ry_d, rz_d = ri[d], rx[d], ry[d], rz[d]
         sx_d, sy_d, sz_d = sx[d], sy[d], sz[d]
         rf_d, rk_d, rt_d, rkg_d = rf[d], rk[d], rt[d], rkg[d]
-        sf_d, st_d = sf[d], st[d]
+        sf_d, st_d = np.array(sf[d]), np.array(st[d])
 
         n = 0
         if len(ri_d) == 0:
@@ -1210,16 +1305,13 @@ def project_pressures(
             s_s = 0
             continue
 
-        z_p_full = np.array(rrst["PRESSURE", i])
-        z_p = z_p_full[ri_d]
-        w_d = np.array(rrst["WAT_DEN", i])
-
-        if not explicit:
-            z_p -= pressure0[ri_d]
-
         if rgrid.dimension[2] > 1:
             if not zones:
-                interp = LinearNDInterpolator(list(zip(rx_d, ry_d, rz_d)), z_p)
+                tri, tcols = Delaunay(np.column_stack((rx_d, ry_d, rz_d))), ri_d
+                pts = np.column_stack((sx_d, sy_d, sz_d))
+                pverts, pweights = barycentric_weights(tri, pts)
+                pts[:, 2] = [val[0] for val in rkg_d[: len(pts)]]
+                gverts, gweights = barycentric_weights(tri, pts)
 
             for k, (x, y, z) in enumerate(zip(sx_d, sy_d, sz_d)):
                 sai_val = sai[count]
@@ -1237,61 +1329,241 @@ def project_pressures(
                                     continue
                                 uniq = np.unique(rk_d[whr])
                                 if len(uniq) == 1:
-                                    interp = LinearNDInterpolator(
-                                        list(zip(rx_d[whr], ry_d[whr])), z_p[whr]
-                                    )
+                                    tri = Delaunay(np.column_stack((rx_d, ry_d))[whr])
                                 else:
                                     whs = sf_d == n
                                     d_t = np.round(
                                         np.min(rt_d[whr]) - np.min(st_d[whs]), 2
                                     )
-                                    interp = LinearNDInterpolator(
-                                        list(zip(rx_d[whr], ry_d[whr], rz_d[whr])),
-                                        z_p[whr],
+                                    tri = Delaunay(
+                                        np.column_stack((rx_d, ry_d, rz_d))[whr]
                                     )
+                                tcols = ri_d[whr]
 
                             if len(np.unique(rk_d[whr])) == 1:
-                                z_b = interp((x, y))
+                                verts, weights = barycentric_weights(tri, [x, y])
                             else:
-                                z_b = interp((x, y, z + d_t))
-                                if np.isnan(z_b):
-                                    z_b = interp((x, y, rkg_d[k][0]))
+                                verts, weights = barycentric_weights(
+                                    tri, [x, y, z + d_t]
+                                )
+                                if np.isnan(weights[0][0]):
+                                    verts, weights = barycentric_weights(
+                                        tri, [x, y, rkg_d[k][0]]
+                                    )
+                            update_boundary(key, tcols[verts[0]], weights[0])
                         else:
-                            if i == 0:
-                                sbound = [
-                                    row for row in sbound if int(row.split()[0]) != key
-                                ]
-                                s_s += 1
+                            sbound["active"][row_of[key]] = False
+                            s_s += 1
                             count += 1
                             continue
                     else:
-                        z_b = interp((x, y, z))
-                        if np.isnan(z_b):
-                            if not explicit:
-                                z_b = interp((x, y, rkg_d[k][0]))
-                            else:
-                                z_b = (
-                                    interp((x, y, rkg_d[k][0]))
-                                    + (z - rkg_d[k][0]) * w_d[rkg_d[k][1]] * 9.81 / 1e5
-                                )
-
-                    update_boundary(key, z_b)
+                        verts, weights, corr = pverts[k], pweights[k], 0.0
+                        if np.isnan(weights[0]):
+                            verts, weights = gverts[k], gweights[k]
+                            if explicit:
+                                corr = (z - rkg_d[k][0]) * 9.81 / 1e5
+                        if update_boundary(key, tcols[verts], weights) and corr:
+                            drows.append(len(keys) - 1)
+                            dcols.append(rkg_d[k][1])
+                            dvals.append(corr)
 
                 count += 1
         else:
-            interp = LinearNDInterpolator(list(zip(rx_d, ry_d)), z_p)
+            tri = Delaunay(np.column_stack((rx_d, ry_d)))
+            pverts, pweights = barycentric_weights(tri, np.column_stack((sx_d, sy_d)))
 
-            for k, (x, y) in enumerate(zip(sx_d, sy_d)):
+            for k in range(len(sx_d)):
                 sai_val = sai[count]
                 key = sai_val + 1
 
                 if sai_val in snum_set:
-                    z_b = interp((x, y))
-                    update_boundary(key, z_b)
+                    update_boundary(key, ri_d[pverts[k]], pweights[k])
 
                 count += 1
 
-    return rp_out, sbound
+    pres = (np.concatenate(rows), np.concatenate(cols), np.concatenate(vals))
+    if not keys:
+        pres = (np.array([], dtype=int), np.array([], dtype=int), np.array([]))
+    dens = (np.array(drows, dtype=int), np.array(dcols, dtype=int), np.array(dvals))
+
+    return assemble_projection(rrst, keys, pres, dens, explicit), sbound
+
+
+def contour_operator(
+    rrst: RestartReader,
+    sgrid: OpmGrid,
+    xy: XYMaps,
+    bc: BCCon,
+    explicit: bool,
+    zones: bool,
+) -> tuple[Projection, NDArray, list[float]]:
+    """Precompute the interpolation weights for the site with irregular contour"""
+    sbound, spres, sopn = bc.sbound, bc.spres, bc.sopn
+    points = np.column_stack((xy.x_i, xy.y_i, xy.z_i))
+    inds, offset = np.array(xy.inds, dtype=int), np.array(xy.offset)
+    coords_eval = np.array(bc.coords)
+    if zones:
+        coords_eval[:, 2] += np.round(xy.rtmin - bc.stmin, 2)
+
+    keys: list[int] = []
+    rows: list[NDArray] = []
+    cols: list[NDArray] = []
+    vals: list[NDArray] = []
+    count, n, whr = 0, -1, np.ones(len(inds), dtype=bool)
+    tcols = np.arange(len(inds))
+    verts, weights = (
+        barycentric_weights(Delaunay(points), coords_eval)
+        if len(bc.coords)
+        else (tcols, tcols)
+    )
+
+    for idx in range(len(bc.coords)):
+        vrt, wgt = tcols[verts[idx]], weights[idx]
+        if zones:
+            zone_key = bc.ksfips[sbound["k"][idx]]
+            if n != zone_key:
+                n = zone_key
+                whr = xy.fipr == n
+                if np.any(whr):
+                    tcols = np.flatnonzero(whr)
+                    verts, weights = barycentric_weights(
+                        Delaunay(points[whr]), coords_eval
+                    )
+        if np.any(whr) and not np.isnan(wgt[0]):
+            count += 1
+            rows.append(np.full(len(wgt), len(keys)))
+            cols.append(vrt)
+            vals.append(wgt)
+            keys.append(count)
+            sbound["id"][idx] = count
+        else:
+            sopn[
+                sgrid.global_index(
+                    int(sbound["i"][idx]), int(sbound["j"][idx]), int(sbound["k"][idx])
+                )
+            ] = -1
+            sbound["active"][idx] = False
+    if not explicit:
+        spres = [val for val, act in zip(spres, sbound["active"]) if act]
+
+    if keys:
+        rows_a, cols_a, vals_a = (
+            np.concatenate(rows),
+            np.concatenate(cols),
+            np.concatenate(vals),
+        )
+    else:
+        rows_a, cols_a, vals_a = np.array([], dtype=int), tcols[:0], np.array([])
+    pres = (rows_a, inds[cols_a], vals_a)
+    dens = (rows_a[:0], inds[cols_a][:0], vals_a[:0])
+    if explicit:
+        dens = (rows_a, inds[cols_a], vals_a * offset[cols_a] * 9.81 / 1e5)
+
+    return (
+        assemble_projection(rrst, keys, pres, dens, explicit),
+        sbound,
+        spres,
+    )
+
+
+def assemble_projection(
+    rrst: RestartReader,
+    keys: list[int],
+    pres: tuple[NDArray, NDArray, NDArray],
+    dens: tuple[NDArray, NDArray, NDArray],
+    explicit: bool,
+) -> Projection:
+    """Build the sparse operators restricted to the regional cells they use"""
+    pcols, pinv = np.unique(pres[1], return_inverse=True)
+    dcols, dinv = np.unique(dens[1], return_inverse=True)
+    nkeys = len(keys)
+    return Projection(
+        keys,
+        csr_matrix((pres[2], (pres[0], pinv)), shape=(nkeys, len(pcols))),
+        pcols,
+        csr_matrix((dens[2], (dens[0], dinv)), shape=(nkeys, len(dcols))),
+        dcols,
+        np.array([]) if explicit else rrst.gather("PRESSURE", 0, pcols),
+    )
+
+
+def barycentric_weights(
+    tri: Delaunay, points: NDArray | list[float]
+) -> tuple[NDArray, NDArray]:
+    """Simplex vertices and barycentric weights (nan outside the convex hull)"""
+    points = np.atleast_2d(np.asarray(points, dtype=float))
+    simplex = tri.find_simplex(points)
+    trans = tri.transform[simplex]
+    ndim = tri.ndim
+    bary = np.einsum("ijk,ik->ij", trans[:, :ndim, :], points - trans[:, ndim, :])
+    weights = np.column_stack((bary, 1.0 - np.sum(bary, axis=1)))
+    weights[simplex < 0] = np.nan
+    return tri.simplices[simplex], weights
+
+
+def project_pressures(
+    rrst: RestartReader,
+    proj: Projection,
+    explicit: bool,
+    steps: range,
+) -> NDArray:
+    """Project the pressures of all given report steps in one pass
+
+    Only the regional cells used by the operators are gathered from the restart
+    file, then the values of all steps are projected at once (steps x faces).
+    """
+    pres = np.empty((len(steps), len(proj.pcols)), dtype=np.float32)
+    dens = np.empty((len(steps), len(proj.dcols)), dtype=np.float32)
+    for n, i in enumerate(steps):
+        pres[n] = rrst.gather("PRESSURE", i, proj.pcols)
+        if not proj.dcols.size:
+            continue
+        if not rrst.count("WAT_DEN", i):
+            print(
+                f"\nThe regional restart {rrst.path} has no WAT_DEN at report step "
+                f"{i}, which is needed to correct the boundary pressures by the "
+                "depth difference, add DEN to the RPTRST keyword of the regional "
+                "deck (or use '-e 0').\n"
+            )
+            raise SystemExit(1)
+        dens[n] = rrst.gather("WAT_DEN", i, proj.dcols)
+    if not explicit:
+        pres -= proj.pressure0
+    z_b = (proj.pres @ pres.T).T
+    if proj.dcols.size:
+        z_b += (proj.dens @ dens.T).T
+    return z_b
+
+
+def copy_includes(fsit: str, fol: str, link: str = "copy") -> None:
+    """Copy (or link) the include files of the site folder to the output folder
+
+    The files are handled in a pool of threads. Hard links fall back to copies
+    across file systems, and the include files written by expreccs are always
+    copied, to not write through a link into the site folder.
+    """
+
+    def place(name: str) -> None:
+        src, dst = f"{fsit}/{name}", f"{fol}/{name}"
+        if os.path.isdir(src):
+            shutil.copytree(src, dst, dirs_exist_ok=True)
+            return
+        if os.path.lexists(dst):
+            os.remove(dst)
+        if link == "symbolic" and name not in GENERATED:
+            os.symlink(os.path.abspath(src), dst)
+            return
+        if link == "hard" and name not in GENERATED:
+            try:
+                os.link(src, dst)
+                return
+            except OSError:
+                pass
+        shutil.copy(src, dst)
+
+    names = [name for name in os.listdir(fsit) if name.endswith(".INC")]
+    with ThreadPoolExecutor() as pool:
+        list(pool.map(place, names))
 
 
 def write_files(
@@ -1300,92 +1572,86 @@ def write_files(
     freq: NDArray,
     ddays: NDArray,
     sdata: str,
-    sbound: list[str],
-    sbc: list[str],
-    sdays: NDArray,
+    sbound: NDArray,
     sopn: NDArray,
+    link: str = "copy",
 ) -> None:
     """Write the deck and include files"""
     freq_max = np.max(freq)
     if fsit != fol:
-        files = [f for f in os.listdir(fsit) if f.endswith(".INC")]
-        for file in files:
-            os.system(f"scp -r {fsit}/{file} {fol}")
+        copy_includes(fsit, fol, link)
     fre, tstep, count = 0, 0, 1
-    lol = []
-    with open(sdata, "r", encoding="utf8") as f:
-        for line in csv.reader(f):
-            nrwo = str(line)[2:-2]
-            if "\t" in nrwo:
-                nrwo = nrwo.replace("\t", " ")
-            lol.append(nrwo)
-            if nrwo == "GRID" and freq_max > 0:
-                lol.append("INCLUDE")
-                lol.append("'BCCON.INC' /")
-            if nrwo == "REGIONS":
-                lol.append("INCLUDE")
-                lol.append("'OPERNUM_EXPRECCS.INC' /")
     out_path = f"{fol}/{fol.split('/')[-1].upper()}.DATA"
-    n_lol = len(lol)
-    lines = []
-    for i, row in enumerate(lol):
-        if i < n_lol - 1:
-            nxt = lol[i + 1]
-            if nxt == "TSTEP" and freq_max > 0:
-                rep_line = lol[i + 2]
-                rep_split = rep_line.split("*")
-                rep = int(rep_split[0]) if len(rep_split) > 1 else 1
-                lines.append(row + "\n")
-                for _ in range(rep):
-                    fval = freq[fre]
-                    for _ in range(fval):
-                        lines.append("INCLUDE\n")
-                        lines.append(f"'bc/BCPROP{count}.INC' /\n")
-                        lines.append("TSTEP\n")
-                        lines.append(f"{ddays[count-1]} /\n")
-                        count += 1
-                        tstep = 1
-                    fre += 1
-            elif tstep == 0:
-                lines.append(row + "\n")
-            else:
-                edit = row.split()
-                if edit and (edit[-1] == "/" or edit[0] == "/"):
-                    tstep = 0
-        else:
-            if tstep == 0:
-                lines.append(row)
+    rows = deck_rows(sdata, freq_max > 0)
+    ahead = deque(islice(rows, 3))
     with open(out_path, "w", encoding="utf8") as f:
-        f.write("".join(lines))
+        while ahead:
+            row = ahead.popleft()
+            ahead.extend(islice(rows, 1))
+            if ahead:
+                if ahead[0] == "TSTEP" and freq_max > 0:
+                    rep_split = ahead[1].split("*")
+                    rep = int(rep_split[0]) if len(rep_split) > 1 else 1
+                    f.write(row + "\n")
+                    for _ in range(rep):
+                        for _ in range(freq[fre]):
+                            f.write("INCLUDE\n")
+                            f.write(f"'bc/BCPROP{count}.INC' /\n")
+                            f.write("TSTEP\n")
+                            f.write(f"{ddays[count-1]} /\n")
+                            count += 1
+                            tstep = 1
+                        fre += 1
+                elif tstep == 0:
+                    f.write(row + "\n")
+                else:
+                    edit = row.split()
+                    if edit and (edit[-1] == "/" or edit[0] == "/"):
+                        tstep = 0
+            elif tstep == 0:
+                f.write(row)
     if freq_max > 0:
         with open(f"{fol}/BCCON.INC", "w", encoding="utf8") as f:
             f.write(HEADER)
             f.write("BCCON\n")
-            f.write("\n".join(sbound))
+            f.write("\n".join(bccon_lines(sbound)))
             f.write("\n/\n")
-        for i, days in enumerate(sdays):
-            with open(f"{fol}/bc/BCPROP{i}.INC", "w", encoding="utf8") as f:
-                f.write(HEADER)
-                f.write(f"-- No. days = {days:.2f}\n")
-                f.write("BCPROP\n")
-                f.write("".join(sbc[i]))
-                f.write("/\n")
-    with open(f"{fol}/OPERNUM_EXPRECCS.INC", "w", encoding="utf8") as f:
-        f.write(HEADER)
-        f.write("OPERNUM\n")
-        f.write("".join(compact_format_numeric(sopn)))
-        f.write("/\n")
+    write_include(f"{fol}/OPERNUM_EXPRECCS.INC", "OPERNUM", sopn)
+
+
+def deck_rows(sdata: str, bccon: bool) -> Iterator[str]:
+    """Rows of the site deck, one at a time, with the expreccs includes added"""
+    with open(sdata, "r", encoding="utf8") as f:
+        for line in csv.reader(f):
+            nrwo = str(line)[2:-2]
+            if "\t" in nrwo:
+                nrwo = nrwo.replace("\t", " ")
+            yield nrwo
+            if nrwo == "GRID" and bccon:
+                yield "INCLUDE"
+                yield "'BCCON.INC' /"
+            if nrwo == "REGIONS":
+                yield "INCLUDE"
+                yield "'OPERNUM_EXPRECCS.INC' /"
+
+
+def bccon_lines(faces: NDArray) -> list[str]:
+    """BCCON entries of the active boundary faces"""
+    return [
+        f"{fid} {i+1} {i+1} {j+1} {j+1} {k+1} {k+1} '{dire}' /"
+        for fid, i, j, k, dire, _ in faces[faces["active"]].tolist()
+    ]
 
 
 def find_ij_orientation(
-    sgrid: OpmGrid,
+    sgeom: Geometry,
 ) -> tuple[int, int]:
     """Right or left grid oriented"""
-    origin = sgrid.xyz_from_ijk(0, 0, 0, True)
+    origin, xnext, ynext = cell_corners(sgeom, np.array([0, 1, sgeom.dims[0]]))
     y1 = origin[1][0]
-    y2 = sgrid.xyz_from_ijk(0, 1, 0, True)[1][0]
+    y2 = ynext[1][0]
     x1 = origin[1][0]
-    x2 = sgrid.xyz_from_ijk(1, 0, 0, True)[1][0]
+    x2 = xnext[1][0]
     if y2 < y1:
         mly = 1
     else:
@@ -1398,109 +1664,71 @@ def find_ij_orientation(
 
 
 def extract_site_borders(
-    sgrid: OpmGrid,
+    sgeom: Geometry,
     sdim: NDArray,
     sinit: OpmFile,
-    srst: OpmRestart,
+    srst: RestartReader,
     boundaries: list[int],
     explicit: bool,
     mly: int,
     mlx: int,
     sfip: NDArray,
 ) -> SiteBorders:
-    """Extract the site border"""
-    spres = []
-    sai = []
-    sbound = []
+    """Extract the site border
+
+    The cells of each side are gathered at once from index arrays, layer by
+    layer and counterclockwise along the side. The inactive cells are skipped,
+    but they keep their number in the faces (and a nan site pressure).
+    """
+    nxy = sdim[0] * sdim[1]
+    active = active_indices(sgeom)
+    half = {name: 0.5 * np.array(sinit[name]) for name in ["DX", "DY", "DZ"]}
+    spres: list[float] = []
+    sai: list[int] = []
+    sbound = np.zeros(0, dtype=FACE)
+    sides: list[list[list]] = [[[], [], [], [], []] for _ in range(4)]
     gc = 0
-    sxn, syn, szn, sfn, stn = [], [], [], [], []
-    sxw, syw, szw, sfw, stw = [], [], [], [], []
-    sxs, syl, szs, sfs, sts = [], [], [], [], []
-    sxe, sye, sze, sfe, ste = [], [], [], [], []
-    d_z = 0.5 * sinit["DZ"]
-    pressure0 = srst["PRESSURE", 0]
-    if boundaries[0] > -1:
-        j = boundaries[0]
-        for k in range(sdim[2]):
-            for i in range(sdim[0]):
-                ind = sgrid.active_index(i, j, k)
-                if ind > -1:
-                    sai.append(gc)
-                    xyz = np.mean(sgrid.xyz_from_ijk(i, j, k, True), axis=1)
-                    d_y = 0.5 * sinit["DY"][ind]
-                    sbound.append(f"{gc+1} {i+1} {i+1} {j+1} {j+1} {k+1} {k+1} 'J-' /")
-                    sxn.append(xyz[0])
-                    syn.append(xyz[1] + mly * d_y)
-                    szn.append(xyz[2])
-                    sfn.append(sfip[ind])
-                    stn.append(xyz[2] - d_z[ind])
-                if not explicit:
-                    spres.append(pressure0[ind])
-                gc += 1
-    if boundaries[1] > -1:
-        i = sdim[0] - 1 - boundaries[1]
-        for k in range(sdim[2]):
-            for j in range(sdim[1]):
-                ind = sgrid.active_index(i, j, k)
-                if ind > -1:
-                    sai.append(gc)
-                    xyz = np.mean(sgrid.xyz_from_ijk(i, j, k, True), axis=1)
-                    d_x = 0.5 * sinit["DX"][ind]
-                    sbound.append(f"{gc+1} {i+1} {i+1} {j+1} {j+1} {k+1} {k+1} 'I' /")
-                    sxw.append(xyz[0] - mlx * d_x)
-                    syw.append(xyz[1])
-                    szw.append(xyz[2])
-                    sfw.append(sfip[ind])
-                    stw.append(xyz[2] - d_z[ind])
-                if not explicit:
-                    spres.append(pressure0[ind])
-                gc += 1
-    if boundaries[2] > -1:
-        j = sdim[1] - 1 - boundaries[2]
-        for k in range(sdim[2]):
-            for i in range(sdim[0]):
-                ii = sdim[0] - i - 1
-                ind = sgrid.active_index(ii, j, k)
-                if ind > -1:
-                    sai.append(gc)
-                    xyz = np.mean(sgrid.xyz_from_ijk(ii, j, k, True), axis=1)
-                    d_y = 0.5 * sinit["DY"][ind]
-                    sbound.append(f"{gc+1} {ii+1} {ii+1} {j+1} {j+1} {k+1} {k+1} 'J' /")
-                    sxs.append(xyz[0])
-                    syl.append(xyz[1] - mly * d_y)
-                    szs.append(xyz[2])
-                    sfs.append(sfip[ind])
-                    sts.append(xyz[2] - d_z[ind])
-                if not explicit:
-                    spres.append(pressure0[ind])
-                gc += 1
-    if boundaries[3] > -1:
-        i = boundaries[3]
-        for k in range(sdim[2]):
-            for j in range(sdim[1]):
-                jj = sdim[1] - j - 1
-                ind = sgrid.active_index(i, jj, k)
-                if ind > -1:
-                    sai.append(gc)
-                    xyz = np.mean(sgrid.xyz_from_ijk(i, jj, k, True), axis=1)
-                    d_x = 0.5 * sinit["DX"][ind]
-                    sbound.append(
-                        f"{gc+1} {i+1} {i+1} {jj+1} {jj+1} {k+1} {k+1} 'I-' /"
-                    )
-                    sxe.append(xyz[0] + mlx * d_x)
-                    sye.append(xyz[1])
-                    sze.append(xyz[2])
-                    sfe.append(sfip[ind])
-                    ste.append(xyz[2] - d_z[ind])
-                if not explicit:
-                    spres.append(pressure0[ind])
-                gc += 1
-    # fmt: off
-    return SiteBorders(
-        spres,sai,sbound,
-        sxn,syn,szn,sfn,stn,
-        sxw,syw,szw,sfw,stw,
-        sxs,syl,szs,sfs,sts,
-        sxe,sye,sze,sfe,ste
-    )
-    # fmt: on
+    for d, (name, fixed) in enumerate(
+        zip(
+            ["J-", "I", "J", "I-"],
+            [
+                boundaries[0],
+                sdim[0] - 1 - boundaries[1],
+                sdim[1] - 1 - boundaries[2],
+                boundaries[3],
+            ],
+        )
+    ):
+        if boundaries[d] < 0:
+            continue
+        along = np.arange(sdim[d % 2])[:: 1 if d < 2 else -1]
+        line = np.tile(along, sdim[2])
+        k = np.repeat(np.arange(sdim[2]), len(along))
+        i, j = (line, np.full_like(line, fixed))[:: 1 if d % 2 == 0 else -1]
+        glob = i + j * sdim[0] + k * nxy
+        act = active[glob] > -1
+        num = gc + np.flatnonzero(act)
+        ind = active[glob[act]]
+        xyz = sgeom.centres[glob[act]]
+        face = xyz.copy()
+        axis = 1 - d % 2
+        face[:, axis] += [mly, -mlx, -mly, mlx][d] * half[["DX", "DY"][axis]][ind]
+        sides[d] = [
+            face[:, 0].tolist(),
+            face[:, 1].tolist(),
+            xyz[:, 2].tolist(),
+            sfip[ind].tolist(),
+            (xyz[:, 2] - half["DZ"][ind]).tolist(),
+        ]
+        faces = np.zeros(len(num), dtype=FACE)
+        faces["id"] = num + 1
+        faces["i"], faces["j"], faces["k"] = i[act], j[act], k[act]
+        faces["dir"], faces["active"] = name, True
+        sbound = np.concatenate((sbound, faces))
+        sai += num.tolist()
+        if not explicit:
+            pres = np.full(len(line), np.nan)
+            pres[act] = srst.gather("PRESSURE", 0, ind)
+            spres += pres.tolist()
+        gc += len(line)
+    return SiteBorders(spres, sai, sbound, *(val for side in sides for val in side))
@@ -0,0 +1,113 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Utiliy classes to read the restart arrays through a cache or a memory map"""
+
+from collections import OrderedDict
+
+import numpy as np
+from numpy.typing import NDArray
+from opm.io.ecl import ERst as OpmRestart
+
+SIZES = {"INTE": 4, "REAL": 4, "LOGI": 4, "DOUB": 8, "CHAR": 8, "MESS": 0}
+TYPES = {"INTE": ">i4", "REAL": ">f4", "DOUB": ">f8"}
+UNMAPPED = (OSError, ValueError)  # e.g., formatted or truncated restart files
+
+
+class MappedFile:
+    """Gather selected entries of the arrays in a binary unified output file
+
+    The file is memory mapped and the keyword headers are indexed once, then
+    only the bytes of the requested entries are read, e.g., the boundary cells
+    of a restart larger than the available memory. The arrays are keyed by the
+    report step number in the preceding SEQNUM record, as in ERst (step 0 for
+    files without them, e.g., INIT).
+    """
+
+    def __init__(self, path: str) -> None:
+        self.data = np.memmap(path, dtype=np.uint8, mode="r")
+        self.arrays: dict[tuple[str, int], tuple[int, int, str]] = {}
+        pos, step = 0, 0
+        while pos < self.data.size:
+            if self.number(pos) != 16:
+                raise ValueError(f"{path} is not a binary unformatted file")
+            name = self.data[pos + 4 : pos + 12].tobytes().decode().strip()
+            count = self.number(pos + 12)
+            kind = self.data[pos + 16 : pos + 20].tobytes().decode()
+            pos += 24
+            if name == "SEQNUM":
+                step = self.number(pos + 4)
+            size, block = SIZES.get(kind, 0), 1000
+            if kind == "CHAR" or kind.startswith("C0"):
+                size, block = SIZES.get(kind, int(kind[1:])), 105
+            self.arrays.setdefault((name, step), (pos, count, kind))
+            pos += count * size + 8 * -(-count // block)
+
+    def number(self, pos: int) -> int:
+        """Big-endian integer at the given byte position"""
+        return int.from_bytes(self.data[pos : pos + 4].tobytes(), "big")
+
+    def __contains__(self, key: tuple[str, int]) -> bool:
+        return key in self.arrays and self.arrays[key][2] in TYPES
+
+    def gather(self, keyword: str, step: int, cells: NDArray) -> NDArray:
+        """Entries of the array at the given (active) indices"""
+        pos, _, kind = self.arrays[(keyword, step)]
+        dtype = np.dtype(TYPES[kind])
+        cells = np.asarray(cells, dtype=int)
+        offsets = (
+            pos
+            + (cells // 1000) * (1000 * dtype.itemsize + 8)
+            + 4
+            + (cells % 1000) * dtype.itemsize
+        )
+        raw = self.data[offsets[:, None] + np.arange(dtype.itemsize)]
+        return raw.view(dtype).ravel().astype(dtype.newbyteorder("="))
+
+
+class RestartReader:
+    """Read the restart arrays keeping the last used ones in memory
+
+    The arrays are cached by (keyword, step) in least recently used order, and
+    the oldest ones are dropped when their total size exceeds the budget. The
+    returned arrays are read only, since they are shared between the callers.
+    With mapped, gather reads only the requested entries from the file.
+    """
+
+    def __init__(self, path: str, budget: int = 1 << 28, mapped: bool = True) -> None:
+        self.path = path
+        self.rst = OpmRestart(path)
+        self.budget = budget
+        self.size = 0
+        self.arrays: OrderedDict[tuple[str, int], NDArray] = OrderedDict()
+        self.mapped = None
+        if mapped:
+            try:
+                self.mapped = MappedFile(path)
+            except UNMAPPED:
+                self.mapped = None
+
+    def __len__(self) -> int:
+        return len(self.rst)
+
+    def count(self, keyword: str, step: int) -> int:
+        """Number of arrays with the keyword in the report step"""
+        return self.rst.count(keyword, step)
+
+    def gather(self, keyword: str, step: int, cells: NDArray) -> NDArray:
+        """Entries of the array at the given (active) indices"""
+        if self.mapped is not None and (keyword, step) in self.mapped:
+            return self.mapped.gather(keyword, step, cells)
+        return self[keyword, step][cells]
+
+    def __getitem__(self, key: tuple[str, int]) -> NDArray:
+        if key in self.arrays:
+            self.arrays.move_to_end(key)
+            return self.arrays[key]
+        array = np.asarray(self.rst[key])
+        array.flags.writeable = False
+        self.arrays[key] = array
+        self.size += array.nbytes
+        while self.size > self.budget and len(self.arrays) > 1:
+            self.size -= self.arrays.popitem(last=False)[1].nbytes
+        return array
@@ -1,14 +1,20 @@
 # SPDX-FileCopyrightText: 2023-2026 NORCE Research AS
 # SPDX-License-Identifier: GPL-3.0
-# pylint: disable=R0912
+# pylint: disable=R0912,R0914,W0123
 
 """Utiliy functions for necessary files and variables to run OPM Flow"""
 
-import csv
+import math
 import os
 import subprocess
 
+import numpy as np
 from mako.template import Template
+from opm.io.ecl import EclOutput
+
+from expreccs.utils.compact import compact_format
+
+MT_ERRORS = (AttributeError, TypeError, ValueError)  # math-only z_xy expressions
 
 
 def write_files(dic, reservoir, iteration=0):
@@ -42,6 +48,12 @@ def write_files(dic, reservoir, iteration=0):
         if name == "regional":
             kwrs += ["opernum"]
         for kwr in kwrs:
+            if dic["binary"]:
+                write_binary(
+                    f"{dic[f'fpre{reservoir}']}{reservoir.upper()}_{kwr.upper()}.IMP",
+                    {kwr.upper(): dic[f"{name}_{kwr}"]},
+                )
+                continue
             dic[f"{name}_{kwr}"] = compact_format(dic[f"{name}_{kwr}"])
             dic[f"{name}_{kwr}"].insert(0, f"{kwr.upper()}\n")
             dic[f"{name}_{kwr}"].append("/")
@@ -72,40 +84,22 @@ def write_files(dic, reservoir, iteration=0):
 
 def write_grid(dic, name, reservoir):
     """Write the corner-point grid"""
-    grid, tmp = [], []
-    grid.append(
-        "-- This file was generated by expreccs https://github.com/cssr-tools/expreccs\n"
-    )
-    grid.append("-- Copyright (C) 2023-2026 NORCE Research AS\n")
-    grid.append("COORD\n")
-    if name in ["reference", "regional"]:
-        for j in range(dic[f"{name}_num_cells"][1] + 1):
-            for i in range(dic[f"{name}_num_cells"][0] + 1):
-                tmp.append(
-                    f"{dic[f'{name}_xmx'][i]:E} {dic[f'{name}_ymy'][j]:E} 0 "
-                    f"{dic[f'{name}_xmx'][i]:E} {dic[f'{name}_ymy'][j]:E} "
-                    f"{dic[f'{name}_dims'][2]:E} "
-                )
-    else:
-        for xcor, ycor in zip(dic["site_xc"], dic["site_yc"]):
-            tmp.append(
-                f"{xcor:E} {ycor:E} 0 {xcor:E} {ycor:E} {dic[f'{name}_dims'][2]:E} "
-            )
-    grid += compact_format("".join(tmp).split())
+    coord, zcorn = grid_arrays(dic, name)
+    if dic["binary"]:
+        write_binary(
+            f"{dic[f'fpre{reservoir}']}{reservoir.upper()}_GRID.IMP",
+            {"COORD": coord, "ZCORN": zcorn},
+        )
+        return
+    grid = [
+        "-- This file was generated by expreccs https://github.com/cssr-tools/expreccs\n",
+        "-- Copyright (C) 2023-2026 NORCE Research AS\n",
+        "COORD\n",
+    ]
+    grid += compact_format(as_written(coord))
     grid.append("/\n")
     grid.append("ZCORN\n")
-    lol, tmp = [], []
-    with open(f"{dic['pat']}/templates/common/grid.mako", "r", encoding="utf8") as file:
-        for i, row in enumerate(csv.reader(file, delimiter="#")):
-            if i == 3:
-                lol.append(f"    return {dic['z_xy']}")
-            elif len(row) == 0:
-                lol.append("")
-            else:
-                lol.append(row[0])
-    var = {"dic": dic, "reservoir": name}
-    gridtemplate = Template(text="\n".join(lol)).render(**var)
-    grid += compact_format("".join(gridtemplate).split())
+    grid += compact_format(as_written(zcorn))
     grid.append("/")
     with open(
         f"{dic[f'fpre{reservoir}']}{reservoir.upper()}_GRID.INC", "w", encoding="utf8"
@@ -113,37 +107,61 @@ def write_grid(dic, name, reservoir):
         file.write("".join(grid))
 
 
-def compact_format(values):
-    """Use the 'n*x' notation to write repited values to save storage"""
-    n, value0, tmp = 0, float(values[0]), []
-    if len(values) == 1:
-        value0 = float(values[0])
-        if value0 == 0:
-            return ["0 "]
-        if value0.is_integer():
-            return [f"{int(value0)} "]
-        return [f"{value0} "]
-    for value in values:
-        valuef = float(value)
-        if value0 != valuef:
-            if value0 == 0:
-                tmp.append(f"{n}*0 " if n > 1 else "0 ")
-            elif value0.is_integer():
-                tmp.append(f"{n}*{int(value0)} " if n > 1 else f"{int(value0)} ")
-            else:
-                tmp.append(f"{n}*{value0} " if n > 1 else f"{value0} ")
-            n = 1
-            value0 = valuef
-        else:
-            n += 1
-    if value0 == float(values[-1]):
-        if value0 == 0:
-            tmp.append(f"{n}*0 " if n > 1 else "0 ")
-        elif value0.is_integer():
-            tmp.append(f"{n}*{int(value0)} " if n > 1 else f"{int(value0)} ")
-        else:
-            tmp.append(f"{n}*{value0} " if n > 1 else f"{value0} ")
-    return tmp
+def write_binary(path, arrays):
+    """Write the arrays in an unformatted file for the IMPORT keyword in the decks
+
+    Integer arrays are written as INTE and the rest as REAL.
+    """
+    out = EclOutput(path)
+    for keyword, values in arrays.items():
+        values = np.asarray(values)
+        out.write(
+            keyword,
+            values.astype(np.int32 if values.dtype.kind in "biu" else np.float32),
+        )
+
+
+def grid_arrays(dic, name):
+    """Build the COORD and ZCORN arrays from the mesh and the z_xy surface"""
+    xmx, ymy = dic[f"{name}_xmx"], dic[f"{name}_ymy"]
+    nx, ny, nz = dic[f"{name}_num_cells"]
+    depth = dic[f"{name}_dims"][2]
+    if name in ["reference", "regional"]:
+        x_c, y_c = np.meshgrid(xmx, ymy)
+    else:
+        x_c = np.reshape(dic["site_xc"], (ny + 1, nx + 1))
+        y_c = np.reshape(dic["site_yc"], (ny + 1, nx + 1))
+    coord = np.stack(
+        [x_c, y_c, np.zeros_like(x_c), x_c, y_c, np.full_like(x_c, depth)], axis=-1
+    )
+
+    top = surface(dic["z_xy"], xmx, ymy)
+    rows = np.arange(ny)[:, None, None, None] + np.arange(2)[None, :, None, None]
+    cols = np.arange(nx)[None, None, :, None] + np.arange(2)[None, None, None, :]
+    top = top[rows, cols].ravel()
+    levels = np.concatenate(([0.0], np.repeat(dic[f"{name}_zmz"][1:nz], 2), [depth]))
+    zcorn = levels[:, None] + top[None, :]
+    return coord.ravel(), zcorn.ravel()
+
+
+def surface(z_xy, xmx, ymy):
+    """Evaluate the z_xy expression (in terms of x, y, and mt) on the corner mesh"""
+    expr = compile(str(z_xy), "z_xy", "eval")
+    x_c, y_c = np.meshgrid(xmx, ymy)
+    try:
+        z_c = eval(expr, {"mt": np}, {"x": x_c, "y": y_c})
+    except MT_ERRORS:
+        z_c = np.vectorize(lambda x, y: eval(expr, {"mt": math}, {"x": x, "y": y}))(
+            x_c, y_c
+        )
+    return np.broadcast_to(np.asarray(z_c, dtype=float), x_c.shape)
+
+
+def as_written(values):
+    """Round the values to the precision of the '%E' text in the grid files"""
+    unique, inverse = np.unique(values, return_inverse=True)
+    text = " ".join(f"{val:E}" for val in unique.tolist())
+    return np.fromstring(text, sep=" ")[inverse.ravel()]
 
 
 def write_properties(dic):
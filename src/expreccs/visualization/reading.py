@@ -13,6 +13,8 @@ from opm.io.ecl import EGrid as OpmGrid
 from opm.io.ecl import ERst as OpmRst
 from opm.io.ecl import ESmry as OpmSmry
 
+from expreccs.utils.restart import RestartReader
+
 GAS_DEN_REF = 1.86843
 WAT_DEN_REF = 998.108
 KG_TO_KT = 1e-6
@@ -121,17 +123,20 @@ def reading_simulations(dic):
             make_arrays(dic, fol, res)
 
 
-def read_fluxes(case):
-    """Fluxes for the back coupling"""
-    rst = OpmRst(case + ".UNRST")
+def read_fluxes(case, cells=None):
+    """Fluxes for the back coupling (only at the given active cells if any)"""
+    rst = RestartReader(case + ".UNRST")
     nt = len(rst)
 
     ip, jp, im, jm = [], [], [], []
     for k in range(nt):
-        ip.append(np.array(rst["FLOWATI+", k]))
-        jp.append(np.array(rst["FLOWATJ+", k]))
-        im.append(np.array(rst["FLOWATI-", k]))
-        jm.append(np.array(rst["FLOWATJ-", k]))
+        for fluxes, keyword in zip(
+            [ip, jp, im, jm], ["FLOWATI+", "FLOWATJ+", "FLOWATI-", "FLOWATJ-"]
+        ):
+            if cells is None:
+                fluxes.append(np.array(rst[keyword, k]))
+            else:
+                fluxes.append(rst.gather(keyword, k, cells))
 
     return [ip, jp, im, jm]
 
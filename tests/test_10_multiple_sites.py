@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test that projecting a regional model to several sites at once matches the
+single-site runs"""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+from expreccs.core.expreccs import main
+
+testpth = Path(__file__).parent
+
+
+def test_10_multiple_sites(tmp_path, monkeypatch):
+    """Compare the files of each site in a multi-site run with its own run"""
+    shutil.copytree(testpth / "site", tmp_path / "site")
+    shutil.copytree(testpth / "site", tmp_path / "site_b")
+    shutil.copytree(testpth / "regional", tmp_path / "regional")
+
+    deck = tmp_path / "site_b" / "SITE.DATA"
+    deck.write_text(
+        deck.read_text(encoding="utf8").replace("0 300.0 0", "0 310.0 0"),
+        encoding="utf8",
+    )
+
+    for folder, name in [
+        ("site", "SITE"),
+        ("site_b", "SITE"),
+        ("regional", "REGIONAL"),
+    ]:
+        subprocess.run(
+            ["flow", "--relaxed-max-pv-fraction=0", f"{name}.DATA"],
+            cwd=tmp_path / folder,
+            check=True,
+        )
+
+    monkeypatch.chdir(tmp_path)
+
+    for flag in [[], ["-e", "0"]]:
+        main(["-i", "regional/REGIONAL site/SITE site_b/SITE", "-o", "multi"] + flag)
+        for site in ["site", "site_b"]:
+            main(["-i", f"regional/REGIONAL {site}/SITE", "-o", "single"] + flag)
+            single, multi = tmp_path / "single", tmp_path / "multi" / site
+            files = sorted(file.name for file in (single / "bc").iterdir())
+            assert files == sorted(file.name for file in (multi / "bc").iterdir())
+            for file in ["BCCON.INC", "OPERNUM_EXPRECCS.INC"] + [
+                f"bc/{file}" for file in files
+            ]:
+                assert (single / file).read_bytes() == (multi / file).read_bytes()
+            for file in ["OPERNUM_EXPRECCS.INC", "FIPNUM_EXPRECCS.INC"]:
+                assert (tmp_path / file).read_bytes() == (
+                    multi / "regional" / file
+                ).read_bytes()
+            shutil.rmtree(single)
+        shutil.rmtree(tmp_path / "multi")
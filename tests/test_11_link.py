@@ -0,0 +1,57 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the site decks with the include files linked instead of copied"""
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+from expreccs.core.expreccs import main
+
+testpth = Path(__file__).parent
+
+
+def test_11_link(tmp_path, monkeypatch):
+    """Run the site decks with hard and symbolic links to the include files"""
+    shutil.copytree(testpth / "site", tmp_path / "site")
+    shutil.copytree(testpth / "regional", tmp_path / "regional")
+
+    equil = "EQUIL\n0 300.0 0 0 0 0 1 1 0 /\n"
+    (tmp_path / "site" / "SITE_EQUIL.INC").write_text(equil, encoding="utf8")
+    deck = tmp_path / "site" / "SITE.DATA"
+    deck.write_text(
+        deck.read_text(encoding="utf8").replace(equil, "INCLUDE\n'SITE_EQUIL.INC' /\n"),
+        encoding="utf8",
+    )
+
+    flow_relaxed = ["flow", "--relaxed-max-pv-fraction=0"]
+
+    for name in ["site", "regional"]:
+        subprocess.run(
+            flow_relaxed + [f"{name.upper()}.DATA"],
+            cwd=tmp_path / name,
+            check=True,
+        )
+
+    monkeypatch.chdir(tmp_path)
+
+    for link in ["hard", "symbolic"]:
+        outname = f"expreccs_{link}"
+
+        main(["-i", "regional/REGIONAL site/SITE", "-o", outname, "-k", link])
+
+        exdir = tmp_path / outname
+        include = exdir / "SITE_EQUIL.INC"
+        assert os.path.samefile(include, tmp_path / "site" / "SITE_EQUIL.INC")
+        assert include.is_symlink() == (link == "symbolic")
+        assert not (exdir / "BCCON.INC").is_symlink()
+
+        subprocess.run(
+            flow_relaxed + [f"{outname.upper()}.DATA"],
+            cwd=exdir,
+            check=True,
+        )
+
+        assert (exdir / f"{outname.upper()}.UNRST").exists()
@@ -0,0 +1,60 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+# pylint: disable=R0914
+
+"""Test the binary grid and region files imported in the decks"""
+
+from pathlib import Path
+
+import numpy as np
+from opm.io.ecl import EclFile, EGrid, ERst, eclArrType
+
+from expreccs.core.expreccs import main
+
+EPS = 1e-3
+
+testpth = Path(__file__).parent
+
+
+def test_12_binary(tmp_path, monkeypatch):
+    """Run the models with text and binary (-x 1) files and compare them"""
+    monkeypatch.chdir(tmp_path)
+
+    for name, flag in [("text", []), ("binary", ["-x", "1"])]:
+        main(["-i", str(testpth / "configs" / "closed.toml"), "-o", name] + flag)
+
+    for folder, keywords in [
+        ("reference", ["FIPNUM"]),
+        ("regional", ["FIPNUM", "OPERNUM"]),
+        ("site_closed", []),
+    ]:
+        case = folder.upper()
+        pre = tmp_path / "binary" / "preprocessing" / folder
+        nx, ny, nz = EGrid(
+            str(tmp_path / "binary" / "simulations" / folder / f"{case}.EGRID")
+        ).dimension
+
+        with open(pre / f"{case}.DATA", encoding="utf8") as f:
+            deck = f.read()
+        assert f"IMPORT\n'{case}_GRID.IMP' /" in deck
+        assert not (pre / f"{case}_GRID.INC").exists()
+
+        assert EclFile(str(pre / f"{case}_GRID.IMP")).arrays == [
+            ("COORD", eclArrType.REAL, 6 * (nx + 1) * (ny + 1)),
+            ("ZCORN", eclArrType.REAL, 8 * nx * ny * nz),
+        ]
+        for keyword in keywords:
+            assert f"IMPORT\n'{case}_{keyword}.IMP' /" in deck
+            assert EclFile(str(pre / f"{case}_{keyword}.IMP")).arrays == [
+                (keyword, eclArrType.INTE, nx * ny * nz)
+            ]
+
+        text, binary = (
+            ERst(str(tmp_path / name / "simulations" / folder / f"{case}.UNRST"))
+            for name in ["text", "binary"]
+        )
+        assert text.report_steps == binary.report_steps
+        step = text.report_steps[-1]
+        assert np.allclose(
+            text["PRESSURE", step], binary["PRESSURE", step], rtol=0, atol=EPS
+        )
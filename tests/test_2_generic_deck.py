@@ -75,6 +75,9 @@ def test_2_generic_deck(tmp_path, monkeypatch):
     content = "".join(lines)
     assert "BCCON" in content
     assert "700 1 1 1 1 7 7 'I-' /\n/" in content
+    # The site box follows the four corners of the rotated site
+    assert sum(line[:1].isdigit() for line in lines) == 664
+    assert "225 25 25 25 25 2 2 'I' /\n" in content
 
     name = exdir / "bc" / "BCPROP90.INC"
     with open(name, "r", encoding="utf8") as f:
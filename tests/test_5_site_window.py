@@ -0,0 +1,70 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+# pylint: disable=R0914
+
+"""Test that the regional window around the site does not change the results"""
+
+import shutil
+import subprocess
+from collections import Counter
+from pathlib import Path
+
+from expreccs.core.expreccs import main
+
+testpth = Path(__file__).parent
+
+
+def test_5_site_window(tmp_path, monkeypatch):
+    """Compare the decks built on the site window with the ones on all cells"""
+    shutil.copytree(testpth / "site", tmp_path / "site")
+    shutil.copytree(testpth / "regional", tmp_path / "regional")
+
+    for name in ["site", "regional"]:
+        subprocess.run(
+            ["flow", "--relaxed-max-pv-fraction=0", f"{name.upper()}.DATA"],
+            cwd=tmp_path / name,
+            check=True,
+        )
+
+    monkeypatch.chdir(tmp_path)
+
+    # Boundary faces and regional OPERNUM values of the closest cells over all
+    # the active regional cells (cKDTree query)
+    for flag, regional, faces, labels in zip(
+        [[], ["-b", "[1,1,1,1]"], ["-n", "1"]],
+        [
+            ["OPERNUM_EXPRECCS.INC", "FIPNUM_EXPRECCS.INC"],
+            ["OPERNUM_EXPRECCS.INC", "FIPNUM_EXPRECCS.INC"],
+            ["regional/OPERNUM_EXPRECCS.INC"],
+        ],
+        [60, 9, 48],
+        [
+            {0: 602, 1: 18, 3: 7, 4: 10, 6: 38},
+            {0: 620, 1: 37, 3: 2, 4: 2, 6: 14},
+            {0: 606, 1: 69},
+        ],
+    ):
+        outputs = []
+        for halo in ["-1", "0", "2"]:
+            outname = f"expreccs{halo}"
+            main(
+                ["-i", "regional/REGIONAL site/SITE", "-o", outname, f"--halo={halo}"]
+                + flag
+            )
+            exdir = tmp_path / outname
+            files = [exdir / "BCCON.INC", exdir / "OPERNUM_EXPRECCS.INC"]
+            files += sorted((exdir / "bc").iterdir())
+            files += [tmp_path / name for name in regional]
+            outputs.append([file.read_text(encoding="utf8") for file in files])
+            shutil.rmtree(exdir)
+
+        bccon, opernum = outputs[0][0], outputs[0][-len(regional)]
+        assert sum(line[:1].isdigit() for line in bccon.splitlines()) == faces
+        values = []
+        for item in opernum.split("OPERNUM")[-1].replace("/", "").split():
+            num, value = item.split("*") if "*" in item else (1, item)
+            values += [int(value)] * int(num)
+        assert Counter(values) == labels
+
+        assert outputs[1] == outputs[0]
+        assert outputs[2] == outputs[0]
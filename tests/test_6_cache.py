@@ -0,0 +1,66 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the reuse of the cached boundary operators"""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+from expreccs.core.expreccs import main
+
+EPS = 1e-3
+
+testpth = Path(__file__).parent
+
+
+def bcprop_pressure(exdir: Path) -> float:
+    """Last pressure in the BCPROP file of the last site report step"""
+    with open(exdir / "bc" / "BCPROP6.INC", encoding="utf8") as f:
+        lines = f.readlines()
+    return float(lines[-2].split(" ")[-2])
+
+
+def test_6_cache(tmp_path, monkeypatch, capsys):
+    """Run the site/regional workflow twice and after rerunning the site"""
+    shutil.copytree(testpth / "site", tmp_path / "site")
+    shutil.copytree(testpth / "regional", tmp_path / "regional")
+
+    flow_relaxed = ["flow", "--relaxed-max-pv-fraction=0"]
+
+    for name in ["site", "regional"]:
+        subprocess.run(
+            flow_relaxed + [f"{name.upper()}.DATA"],
+            cwd=tmp_path / name,
+            check=True,
+        )
+
+    monkeypatch.chdir(tmp_path)
+
+    base_cmd = ["-i", "regional/REGIONAL site/SITE", "-e", "0"]
+    exdir = tmp_path / "expreccs"
+
+    main(base_cmd + ["-o", "expreccs"])
+    assert "Using the cached" not in capsys.readouterr().out
+    pressure = bcprop_pressure(exdir)
+
+    main(base_cmd + ["-o", "expreccs"])
+    assert "Using the cached" in capsys.readouterr().out
+    assert abs(bcprop_pressure(exdir) - pressure) < EPS
+
+    # A new site initial pressure changes the offset of the BCPROP pressures
+    deck = tmp_path / "site" / "SITE.DATA"
+    deck.write_text(
+        deck.read_text(encoding="utf8").replace("0 300.0 0", "0 310.0 0"),
+        encoding="utf8",
+    )
+    subprocess.run(flow_relaxed + ["SITE.DATA"], cwd=tmp_path / "site", check=True)
+
+    main(base_cmd + ["-o", "expreccs"])
+    assert "Using the cached" not in capsys.readouterr().out
+    main(base_cmd + ["-o", "expreccs_new"])
+
+    assert abs(bcprop_pressure(exdir) - pressure) > 1.0
+    assert (
+        abs(bcprop_pressure(exdir) - bcprop_pressure(tmp_path / "expreccs_new")) < EPS
+    )
@@ -0,0 +1,34 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test the memory mapped reading of the restart files"""
+
+import numpy as np
+from opm.io.ecl import EclOutput
+
+from expreccs.utils.restart import MappedFile, RestartReader
+
+
+def test_7_restart(tmp_path):
+    """Gather the arrays of a restart file with a gap in the report steps"""
+    path = str(tmp_path / "GAP.UNRST")
+    steps = [0, 2, 5]
+    out = EclOutput(path)
+    for step in steps:
+        out.write("SEQNUM", np.array([step], dtype=np.int32))
+        out.write("DOUBHEAD", np.array([10.0 * step, 1.0]))
+        out.write("PRESSURE", np.arange(2500, dtype=np.float32) + step)
+    del out
+
+    mapped = MappedFile(path)
+    assert sorted(key for key in mapped.arrays if key[0] == "PRESSURE") == [
+        ("PRESSURE", step) for step in steps
+    ]
+    assert ("PRESSURE", 1) not in mapped
+
+    cells = np.array([0, 999, 1000, 2499])
+    for step in steps:
+        assert np.array_equal(mapped.gather("PRESSURE", step, cells), cells + step)
+        for reader in [RestartReader(path), RestartReader(path, mapped=False)]:
+            assert np.array_equal(reader.gather("PRESSURE", step, cells), cells + step)
+            assert reader["DOUBHEAD", step][0] == 10.0 * step
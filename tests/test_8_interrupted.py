@@ -0,0 +1,59 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test that an interrupted run does not leave reusable BCPROP files behind"""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from expreccs.core.expreccs import main
+from expreccs.utils import reg_sit_given_decks
+
+testpth = Path(__file__).parent
+
+
+def test_8_interrupted(tmp_path, monkeypatch):
+    """Interrupt a rerun after its BCPROP files are written, then run again"""
+    shutil.copytree(testpth / "site", tmp_path / "site")
+    shutil.copytree(testpth / "regional", tmp_path / "regional")
+
+    for name in ["site", "regional"]:
+        subprocess.run(
+            ["flow", "--relaxed-max-pv-fraction=0", f"{name.upper()}.DATA"],
+            cwd=tmp_path / name,
+            check=True,
+        )
+
+    monkeypatch.chdir(tmp_path)
+
+    base_cmd = ["-i", "regional/REGIONAL site/SITE", "-o", "expreccs"]
+    exdir = tmp_path / "expreccs"
+    state = exdir / reg_sit_given_decks.STATE
+
+    main(base_cmd)
+    assert state.exists()
+    expected = {
+        file.name: file.read_text(encoding="utf8") for file in (exdir / "bc").iterdir()
+    }
+
+    write_bcprop = reg_sit_given_decks.write_bcprop
+
+    def interrupted(*args, **kwargs):
+        write_bcprop(*args, **kwargs)
+        raise KeyboardInterrupt
+
+    # Other site report steps overwrite the BCPROP files, and the run stops
+    # before finishing
+    with monkeypatch.context() as patch:
+        patch.setattr(reg_sit_given_decks, "write_bcprop", interrupted)
+        with pytest.raises(KeyboardInterrupt):
+            main(base_cmd + ["-f", "2"])
+    assert not state.exists()
+
+    main(base_cmd)
+    assert state.exists()
+    for name, text in expected.items():
+        assert (exdir / "bc" / name).read_text(encoding="utf8") == text
@@ -0,0 +1,42 @@
+# SPDX-FileCopyrightText: 2026 NORCE Research AS
+# SPDX-License-Identifier: GPL-3.0
+
+"""Test that the BCPROP files written in parallel match the serial ones"""
+
+import shutil
+import subprocess
+from pathlib import Path
+
+from expreccs.core.expreccs import main
+
+testpth = Path(__file__).parent
+
+
+def test_9_jobs(tmp_path, monkeypatch):
+    """Compare the output files of the serial and parallel (-j 2) runs"""
+    shutil.copytree(testpth / "site", tmp_path / "site")
+    shutil.copytree(testpth / "regional", tmp_path / "regional")
+
+    for name in ["site", "regional"]:
+        subprocess.run(
+            ["flow", "--relaxed-max-pv-fraction=0", f"{name.upper()}.DATA"],
+            cwd=tmp_path / name,
+            check=True,
+        )
+
+    monkeypatch.chdir(tmp_path)
+
+    base_cmd = ["-i", "regional/REGIONAL site/SITE"]
+
+    for name, flag in zip(
+        ["", "_dpincrease", "_frequency"],
+        [[], ["-e", "0"], ["-n", "1", "-f", "2"]],
+    ):
+        serial, parallel = tmp_path / f"expreccs{name}", tmp_path / f"jobs{name}"
+        main(base_cmd + ["-o", serial.name] + flag)
+        main(base_cmd + ["-o", parallel.name, "-j", "2"] + flag)
+
+        files = sorted(file.name for file in (serial / "bc").iterdir())
+        assert files == sorted(file.name for file in (parallel / "bc").iterdir())
+        for file in ["BCCON.INC"] + [f"bc/{file}" for file in files]:
+            assert (serial / file).read_bytes() == (parallel / file).read_bytes()